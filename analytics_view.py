@@ -1,24 +1,81 @@
 # analytics_view.py
+# 요청 분석 리포트: 필요한 날짜 파티션만 읽고, 요약은 기록기가 유지하는
+# 일별 누적 집계(agg-*.json)를 합쳐서 만든다 (원본 로그 전체를 다시 파싱하지 않음).
+#
+#   python analytics_view.py                 # 오늘(UTC) 요약 + 상세 + 엑셀
+#   python analytics_view.py --date 2025-05-14 --summary-only
 
-import pandas as pd
+import os
+import csv
+import glob
+import json
+import argparse
 from datetime import datetime
 
-# 1) 로그 CSV 경로
-LOG_CSV = "data/analytics_log.csv"
+from request_log import ANALYTICS_DIR, LOG_FIELDS, partition_dir
+from xlsx_writer import write_xlsx
 
-# 2) 파일 읽기 (한글 깨짐 방지)
-df = pd.read_csv(LOG_CSV, encoding="utf-8-sig", parse_dates=["timestamp"])
+# 1) 인자: 날짜(기본 오늘, UTC) / 요약만
+ap = argparse.ArgumentParser()
+ap.add_argument("--date", default=datetime.utcnow().date().isoformat())
+ap.add_argument("--summary-only", action="store_true")
+ap.add_argument("--dir", default=os.getenv("ANALYTICS_DIR", ANALYTICS_DIR))
+args = ap.parse_args()
+part = partition_dir(args.date, args.dir)
 
-# 3) 오늘 날짜 필터
-today = datetime.utcnow().date()
-today_df = df[df["timestamp"].dt.date == today]
+# 2) 일별 누적 집계 합치기 (프로세스별 agg 파일)
+summary = {"requests": 0, "gpt_fallback": 0, "by_endpoint": {}, "by_status": {},
+           "by_template": {}, "by_step": {}, "by_cache": {}}
+for path in glob.glob(os.path.join(part, "agg-*.json")):
+    with open(path, encoding="utf-8") as f:
+        agg = json.load(f)
+    summary["requests"] += agg["requests"]
+    summary["gpt_fallback"] += agg["gpt_fallback"]
+    for ep, v in agg["by_endpoint"].items():
+        cur = summary["by_endpoint"].setdefault(ep, {"count": 0, "latency_ms_sum": 0.0, "latency_ms_max": 0.0})
+        cur["count"] += v["count"]
+        cur["latency_ms_sum"] += v["latency_ms_sum"]
+        cur["latency_ms_max"] = max(cur["latency_ms_max"], v["latency_ms_max"])
+    for key in ("by_status", "by_template", "by_step", "by_cache"):
+        for k, n in agg[key].items():
+            summary[key][k] = summary[key].get(k, 0) + n
 
-# 4) 콘솔에 출력
-pd.set_option("display.max_rows", None)   # 전체 행 보이도록
-print(f"=== {today.isoformat()} 요청 로그 ({len(today_df)}건) ===")
-print(today_df)
+# 3) 콘솔에 요약 출력
+print(f"=== {args.date} 요청 요약 ({summary['requests']}건, GPT fallback {summary['gpt_fallback']}건) ===")
+for ep, v in sorted(summary["by_endpoint"].items()):
+    avg = v["latency_ms_sum"] / v["count"] if v["count"] else 0
+    print(f"  {ep:<22} {v['count']:>8}건  평균 {avg:8.1f}ms  최대 {v['latency_ms_max']:8.1f}ms")
+for key, title in (("by_step", "매칭 단계"), ("by_cache", "캐시"), ("by_status", "상태코드")):
+    if summary[key]:
+        print(f"  {title}: " + ", ".join(f"{k}={n}" for k, n in sorted(summary[key].items())))
+top = sorted(summary["by_template"].items(), key=lambda kv: -kv[1])[:10]
+if top:
+    print("  상위 템플릿: " + ", ".join(f"{k}({n})" for k, n in top))
 
-# 5) 엑셀로도 저장
-OUT_XLSX = "analytics_log_today.xlsx"
-today_df.to_excel(OUT_XLSX, index=False)
-print(f"{OUT_XLSX} 파일이 생성되었습니다.")
+if not args.summary_only:
+    # 4) 해당 날짜 파티션의 상세 로그만 읽기 (한글 깨짐 방지)
+    numeric = {"status": int, "gpt_fallback": int, "latency_ms": float}
+
+    def cell(r: dict, c: str):
+        v = r.get(c) or ""
+        try:
+            return numeric[c](v) if c in numeric and v else v
+        except ValueError:
+            return v
+
+    rows = []
+    for p in sorted(glob.glob(os.path.join(part, "part-*.csv"))):
+        with open(p, encoding="utf-8", newline="") as f:
+            rows.extend(tuple(cell(r, c) for c in LOG_FIELDS) for r in csv.DictReader(f))
+    rows.sort(key=lambda r: r[0])  # timestamp
+
+    print(f"=== {args.date} 요청 로그 ({len(rows)}건) ===")
+    print("\t".join(LOG_FIELDS))
+    for r in rows:
+        print("\t".join(map(str, r)))
+
+    # 5) 엑셀로도 저장 (write-only 모드, 셀 객체를 메모리에 쌓지 않음)
+    OUT_XLSX = f"analytics_log_{args.date}.xlsx"
+    with open(OUT_XLSX, "wb") as f:
+        write_xlsx(f, LOG_FIELDS, rows)
+    print(f"{OUT_XLSX} 파일이 생성되었습니다.")
@@ -1,34 +1,34 @@
-from flask import Flask, request, jsonify
-import pandas as pd
-import os
+# app_route.py
+# 산안법 질문 → 고정 응답 템플릿 라우트
 
-app = Flask(__name__)
+from flask import Blueprint, request, jsonify
 
-# 질문-응답 템플릿 CSV 로드
-CSV_PATH = "/mnt/data/산안법_질문응답_고정템플릿_20개.csv"
-if os.path.exists(CSV_PATH):
-    df = pd.read_csv(CSV_PATH)
-else:
-    df = pd.DataFrame(columns=["질문문장", "조문번호", "조문제목", "응답템플릿"])
+from qa_router import qa_router
+from request_log import annotate
 
-@app.route("/route_answer", methods=["GET"])
+bp = Blueprint("qa", __name__)
+
+# 질문-응답 템플릿: 정규화 해시맵 + n-gram TF-IDF 색인 (qa_router 참고)
+
+@bp.route("/route_answer", methods=["GET"])
 def route_answer():
     user_q = request.args.get("question", "").strip()
     if not user_q:
         return jsonify({"error": "질문이 비어 있습니다."}), 400
 
-    match = df[df["질문문장"] == user_q]
+    match, score, how = qa_router.match(user_q)
+    annotate(keyword=user_q, step=how, gpt_fallback=match is None)
 
-    if not match.empty:
+    if match is not None:
         return jsonify({
-            "answer": match.iloc[0]["응답템플릿"],
-            "source": match.iloc[0]["조문번호"]
+            "answer": match["응답템플릿"],
+            "source": match["조문번호"],
+            "score": round(score, 4),
+            "match": how
         })
     else:
         return jsonify({
             "route_to_gpt": True,
-            "original_question": user_q
+            "original_question": user_q,
+            "score": round(score, 4)
         })
-
-if __name__ == "__main__":
-    app.run(host="0.0.0.0", port=10001)
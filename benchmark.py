@@ -0,0 +1,488 @@
+# benchmark.py
+# 재현 가능한 성능 측정: 실제 Flask 앱을 test client 로 호출한다.
+# OpenAI / 네이버 / 안전신문은 지연시간을 조절할 수 있는 로컬 가짜 서버로 대체하고,
+# 카탈로그 크기(기본 75/1k/10k 템플릿)마다 새 프로세스에서 합성 카탈로그를 올려
+# 시나리오별 p50/p95/p99, 처리량, 최대 RSS 를 JSON 기준선으로 남긴다.
+#
+#   python benchmark.py                                  # benchmark.json 에 기록
+#   python benchmark.py --sizes 75,1000 --out new.json --compare benchmark.json
+#   python benchmark.py --openai-latency 1.5 --threads 4
+
+import os
+import csv
+import sys
+import json
+import time
+import random
+import shutil
+import argparse
+import platform
+import tempfile
+import threading
+import subprocess
+import multiprocessing
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+from urllib.parse import parse_qs, urlparse
+
+from template_catalog import CATALOG_PATH, OUTPUT_COLUMNS
+
+# ── 합성 카탈로그 ─────────────────────────────────────────────────────────────
+AREAS = [
+    "본관", "별관", "생산동", "물류창고", "기숙사", "지하주차장", "옥상", "전기실", "기계실", "보일러실",
+    "클린룸", "도장부스", "용접장", "자재야적장", "정비동", "연구동", "냉동창고", "배관랙", "변전소", "사무동",
+    "A동", "B동", "C동", "D동", "E동", "1공장", "2공장", "3공장", "항만", "터널",
+]
+WORKS = [
+    "고소작업", "밀폐공간작업", "정전작업", "해체작업", "크레인작업", "화기작업", "전기작업", "굴착기작업",
+    "용접용단작업", "비계작업", "협착위험작업", "양중작업", "고압가스작업", "중량물취급", "지게차작업",
+    "도장작업", "방수작업", "철골조립", "거푸집설치", "콘크리트타설", "배관교체", "덕트설치", "조명교체",
+    "승강기점검", "소방설비점검", "방사선작업", "유기용제취급", "분진작업", "소음작업", "고열작업",
+    "동절기작업", "해빙기점검", "우기대비점검", "석면해체", "특수건강진단", "안전교육", "위험성평가",
+    "TBM", "LOTO", "JSA",
+]
+DOCS = ["작업계획서", "허가서", "점검표", "체크리스트", "서식", "양식", "기록부", "일지", "보고서", "대장"]
+SUFFIX_SWAPS = ["계획서", "양식", "서식", "점검표", "표"]
+
+
+def synthetic_catalog(path: str, n_templates: int, seed: int = 0) -> List[str]:
+    """실제 카탈로그 행을 재사용해 n 개 템플릿짜리 CSV 생성 → 템플릿명 목록"""
+    with open(CATALOG_PATH, encoding="utf-8-sig", newline="") as f:
+        reader = csv.DictReader(f)
+        fields = reader.fieldnames
+        by_tpl: Dict[str, List[dict]] = {}
+        for r in reader:
+            by_tpl.setdefault(r["템플릿명"], []).append(r)
+    bodies = list(by_tpl.values())
+
+    rnd = random.Random(seed)
+    combos = [(a, w, d) for a in AREAS for w in WORKS for d in DOCS]
+    if n_templates > len(combos):
+        raise SystemExit(f"합성 카탈로그는 최대 {len(combos)}개 템플릿까지 만들 수 있습니다.")
+    names = [f"{a} {w}{d}" for a, w, d in rnd.sample(combos, n_templates)]
+
+    with open(path, "w", encoding="utf-8-sig", newline="") as f:
+        w = csv.DictWriter(f, fieldnames=fields)
+        w.writeheader()
+        for i, name in enumerate(names):
+            for r in bodies[i % len(bodies)]:
+                w.writerow(dict(r, 템플릿명=name))
+    return names
+
+
+# ── 키워드 코퍼스: 정확 / 접미사 변형 / 오타 / 미등록(GPT 폴백) ─────────────────
+def _suffix_variant(name: str, rnd: random.Random) -> str:
+    for suf in ("작업계획서", "계획서", "허가서", "점검표", "체크리스트", "서식", "양식", "기록부", "일지", "보고서", "대장"):
+        if name.endswith(suf):
+            base = name[:-len(suf)]
+            break
+    else:
+        base = name
+    v = base + rnd.choice(SUFFIX_SWAPS)
+    return rnd.choice([v, v.replace(" ", "_"), v.replace(" ", "")])
+
+
+def _typo(name: str, rnd: random.Random) -> str:
+    s = name.replace(" ", "")
+    if len(s) < 4:
+        return s
+    i = rnd.randrange(1, len(s) - 1)
+    if rnd.random() < 0.5:
+        return s[:i] + s[i + 1:]
+    return s[:i - 1] + s[i] + s[i - 1] + s[i + 1:]
+
+
+def keyword_corpus(names: List[str], n: int, n_unknown: int, seed: int = 0) -> Dict[str, List[str]]:
+    rnd = random.Random(seed)
+    pick = lambda: rnd.choice(names)
+    return {
+        "exact": [pick() for _ in range(n)],
+        "suffix": [_suffix_variant(pick(), rnd) for _ in range(n)],
+        "typo": [_typo(pick(), rnd) for _ in range(n)],
+        # 매번 다른 키워드라 LLM 캐시에 걸리지 않고 가짜 OpenAI 까지 간다
+        "unknown": [f"뷁쉛꿻 {seed}-{i} 양식" for i in range(n_unknown)],
+    }
+
+
+# ── 가짜 외부 서비스 (OpenAI / 네이버 뉴스 API / 안전신문) ──────────────────────
+class FakeUpstreams:
+    def __init__(self, openai_latency: float, naver_latency: float, safetynews_latency: float):
+        self.latency = {"openai": openai_latency, "naver": naver_latency, "safetynews": safetynews_latency}
+        self.calls = {"openai": 0, "naver": 0, "safetynews": 0}
+        self._lock = threading.Lock()
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self.server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def close(self) -> None:
+        self.server.shutdown()
+
+    def _hit(self, kind: str) -> None:
+        with self._lock:
+            self.calls[kind] += 1
+        time.sleep(self.latency[kind])
+
+    def _handler(self):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def _send(self, body: str, ctype: str) -> None:
+                data = body.encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", ctype)
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_POST(self):
+                req = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+                fake._hit("openai")
+                if "JSON 배열" in req["messages"][0]["content"]:
+                    content = json.dumps([
+                        {c: f"{c} {i}" for c in OUTPUT_COLUMNS} for i in range(6)
+                    ], ensure_ascii=False)
+                else:
+                    content = "📌 산업 안전 및 보건 최신 뉴스\n(가짜 응답)"
+                self._send(json.dumps({
+                    "id": "chatcmpl-bench", "object": "chat.completion", "created": int(time.time()),
+                    "model": req.get("model", ""),
+                    "choices": [{"index": 0, "finish_reason": "stop",
+                                 "message": {"role": "assistant", "content": content}}],
+                    "usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0},
+                }, ensure_ascii=False), "application/json")
+
+            def do_GET(self):
+                u = urlparse(self.path)
+                q = {k: v[0] for k, v in parse_qs(u.query).items()}
+                now = datetime.now(timezone.utc)
+                if u.path == "/v1/search/news.json":
+                    fake._hit("naver")
+                    kw = q.get("query", "")
+                    items = [{
+                        "title": f"<b>{kw}</b> 관련 기사 {i}",
+                        "originallink": f"{fake.url}/naver/{kw}/{i}",
+                        "link": f"{fake.url}/naver/{kw}/{i}",
+                        "description": f"<b>{kw}</b> 본문 요약 " * 5,
+                        "pubDate": now.strftime("%a, %d %b %Y %H:%M:%S +0000"),
+                    } for i in range(2)]
+                    self._send(json.dumps({"items": items}, ensure_ascii=False), "application/json")
+                elif u.path == "/search/news":
+                    fake._hit("safetynews")
+                    kw = q.get("searchword", "")
+                    items = "".join(
+                        f'<div class="article-list-content">'
+                        f'<a class="list-titles" href="/news/articleView.html?idxno={abs(hash(kw)) % 10000}{i}">{kw} 기사 {i}</a>'
+                        f'<div class="list-dated">{now.strftime("%Y-%m-%d %H:%M")}</div></div>'
+                        for i in range(2)
+                    )
+                    self._send(f"<html><body>{items}</body></html>", "text/html; charset=utf-8")
+                elif u.path == "/news/articleView.html":
+                    fake._hit("safetynews")
+                    body = "<p>기사 본문 문단입니다.</p>" * 40
+                    self._send(f'<html><body><div id="article-view-content-div">{body}</div></body></html>',
+                               "text/html; charset=utf-8")
+                else:
+                    self.send_error(404)
+
+        return Handler
+
+
+# ── 측정 ──────────────────────────────────────────────────────────────────────
+def percentile(sorted_vals: List[float], p: float) -> float:
+    if not sorted_vals:
+        return 0.0
+    k = max(0, min(len(sorted_vals) - 1, int(round(p / 100 * len(sorted_vals) + 0.5)) - 1))
+    return sorted_vals[k]
+
+
+def summarize(latencies: List[float], wall: float, errors: int) -> dict:
+    s = sorted(latencies)
+    ms = lambda v: round(v * 1000, 3)
+    return {
+        "count": len(s),
+        "errors": errors,
+        "p50_ms": ms(percentile(s, 50)),
+        "p95_ms": ms(percentile(s, 95)),
+        "p99_ms": ms(percentile(s, 99)),
+        "mean_ms": ms(sum(s) / len(s)) if s else 0.0,
+        "max_ms": ms(s[-1]) if s else 0.0,
+        "throughput_rps": round(len(s) / wall, 2) if wall > 0 else 0.0,
+    }
+
+
+def run_requests(app, reqs: List[dict], threads: int) -> dict:
+    """reqs: {"method", "path", "query"/"json"} 목록을 threads 개 스레드로 나눠 호출"""
+    latencies: List[float] = []
+    errors = [0]
+    lock = threading.Lock()
+    it = iter(reqs)
+
+    def worker():
+        client = app.test_client()
+        mine, bad = [], 0
+        while True:
+            with lock:
+                r = next(it, None)
+            if r is None:
+                break
+            t0 = time.perf_counter()
+            resp = client.open(r["path"], method=r.get("method", "GET"),
+                               query_string=r.get("query"), json=r.get("json"))
+            resp.get_data()  # 스트리밍 본문까지 모두 소비
+            mine.append(time.perf_counter() - t0)
+            bad += resp.status_code >= 500
+            resp.close()
+        with lock:
+            latencies.extend(mine)
+            errors[0] += bad
+
+    start = time.perf_counter()
+    ts = [threading.Thread(target=worker) for _ in range(max(1, threads))]
+    for t in ts:
+        t.start()
+    for t in ts:
+        t.join()
+    return summarize(latencies, time.perf_counter() - start, errors[0])
+
+
+def _rss_mb() -> float:
+    import resource
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / 1024 / (1024 if sys.platform == "darwin" else 1), 1)
+
+
+def bench_size(size: int, upstream_url: str, opts: dict) -> dict:
+    """새 프로세스에서 실행: 합성 카탈로그 하나에 대한 전체 시나리오"""
+    work = tempfile.mkdtemp(prefix=f"bench-{size}-")
+    try:
+        csv_path = os.path.join(work, "catalog.csv")
+        names = synthetic_catalog(csv_path, size, opts["seed"])
+
+        # 앱 import 전에 외부 서비스/저장 경로를 가짜 서버·임시 디렉터리로 돌린다
+        os.environ.update(
+            OPENAI_API_KEY="bench", OPENAI_BASE_URL=upstream_url + "/v1",
+            NAVER_CLIENT_ID="bench", NAVER_CLIENT_SECRET="bench", NEWS_SCHEDULER="0",
+            LLM_CACHE_PATH=os.path.join(work, "llm_cache.db"),
+            NEWS_DB_PATH=os.path.join(work, "news.db"),
+            ANALYTICS_DIR=os.path.join(work, "analytics"),
+            XLSX_PREBUILT_DIR=os.path.join(work, "xlsx"),
+        )
+        result = {"templates": size, "rss_start_mb": _rss_mb()}
+
+        t0 = time.perf_counter()
+        import news_crawler
+        import template_catalog
+        from app import create_app
+        from news_scheduler import refresh_news
+        from qa_router import qa_router
+        news_crawler.NAVER_NEWS_URL = upstream_url + "/v1/search/news.json"
+        news_crawler.SAFETYNEWS_BASE = upstream_url
+        result["import_ms"] = round((time.perf_counter() - t0) * 1000, 1)
+
+        template_catalog.catalog.path = csv_path
+        template_catalog.catalog.compiled_path = None
+        if opts["compiled"]:
+            from catalog_build import build
+            t0 = time.perf_counter()
+            template_catalog.catalog.compiled_path = os.path.join(work, "catalog.catalog")
+            build(csv_path, template_catalog.catalog.compiled_path)
+            result["catalog_build_ms"] = round((time.perf_counter() - t0) * 1000, 1)
+        t0 = time.perf_counter()
+        snap = template_catalog.catalog.reload()
+        result["catalog_load_ms"] = round((time.perf_counter() - t0) * 1000, 1)
+        if opts["prerender"]:
+            from xlsx_prebuilt import prebuilt_xlsx, prerender
+            t0 = time.perf_counter()
+            prerender(snap, prebuilt_xlsx.out_dir, workers=1)  # 데몬 풀 프로세스 안
+            result["prerender_ms"] = round((time.perf_counter() - t0) * 1000, 1)
+
+        t0 = time.perf_counter()
+        app = create_app(warm=opts["warm"], scheduler=False)
+        result["app_start_ms"] = round((time.perf_counter() - t0) * 1000, 1)
+        result["rss_after_load_mb"] = _rss_mb()
+
+        threads = opts["threads"]
+        corpus = keyword_corpus(names, opts["requests"], opts["unknown_requests"], opts["seed"])
+        scenarios = {}
+        # resolver 단독 (HTTP/렌더링 제외): 카탈로그 크기에 따른 증가를 main 에서 비교
+        for kind in ("exact", "suffix", "typo"):
+            lat, misses, t0 = [], 0, time.perf_counter()
+            for k in corpus[kind]:
+                t1 = time.perf_counter()
+                try:
+                    snap.resolver.resolve(k)
+                except ValueError:
+                    misses += 1
+                lat.append(time.perf_counter() - t1)
+            scenarios[f"resolve/{kind}"] = summarize(lat, time.perf_counter() - t0, misses)
+        scenarios["list_templates"] = run_requests(
+            app, [{"path": "/list_templates"}] * max(1, opts["requests"] // 10), threads)
+        for kind, kws in corpus.items():
+            scenarios[f"create_xlsx/{kind}"] = run_requests(
+                app, [{"path": "/create_xlsx", "query": {"template": k}} for k in kws], threads)
+
+        rnd = random.Random(opts["seed"])
+        mixed = corpus["exact"] + corpus["suffix"] + corpus["typo"]
+        scenarios["create_xlsx_batch"] = run_requests(app, [
+            {"path": "/create_xlsx_batch", "method": "POST",
+             "json": {"templates": rnd.sample(mixed, min(10, len(mixed))), "format": fmt}}
+            for fmt in ("xlsx", "zip") for _ in range(max(1, opts["requests"] // 20))
+        ], threads)
+
+        questions = [r["질문문장"] for r in qa_router.rows] or ["안전교육은 얼마나 해야 하나요?"]
+        scenarios["route_answer"] = run_requests(app, [
+            {"path": "/route_answer", "query": {"question": rnd.choice(questions) + rnd.choice(["", "?", " 알려줘"])}}
+            for _ in range(opts["requests"])
+        ], threads)
+
+        lat, t0 = [], time.perf_counter()
+        for _ in range(opts["news_refreshes"]):
+            t1 = time.perf_counter()
+            refresh_news()
+            lat.append(time.perf_counter() - t1)
+        scenarios["news_refresh"] = summarize(lat, time.perf_counter() - t0, 0)
+        scenarios["daily_news"] = run_requests(app, [{"path": "/daily_news"}] * opts["requests"], threads)
+        scenarios["render_news"] = run_requests(
+            app, [{"path": "/render_news"}] * max(1, opts["requests"] // 10), threads)
+
+        result["scenarios"] = scenarios
+        result["peak_rss_mb"] = _rss_mb()
+        return result
+    finally:
+        shutil.rmtree(work, ignore_errors=True)
+
+
+# ── 크기 증가에 따른 resolver 조회 시간 ───────────────────────────────────────
+def resolve_scaling(results: Dict[str, dict], max_growth: float) -> List[str]:
+    """가장 작은/큰 카탈로그의 resolve/* 평균 시간 비 — max_growth 배를 넘는 항목 목록"""
+    sizes = sorted(results, key=int)
+    if len(sizes) < 2:
+        return []
+    small, large = results[sizes[0]]["scenarios"], results[sizes[-1]]["scenarios"]
+    failures = []
+    print(f"\n{'resolver':<16} {sizes[0]:>8} → {sizes[-1]:<8} (평균 ms)")
+    for name in sorted(n for n in large if n.startswith("resolve/")):
+        a, b = small[name]["mean_ms"], large[name]["mean_ms"]
+        growth = b / a if a else 0.0
+        print(f"{name:<16} {a:>8.3f} → {b:<8.3f} x{growth:.1f}")
+        if growth > max_growth:
+            failures.append(f"{name}: {sizes[0]}→{sizes[-1]} 템플릿에서 x{growth:.1f} (상한 x{max_growth:g})")
+    return failures
+
+
+# ── 기준선 비교 ───────────────────────────────────────────────────────────────
+def compare(old: dict, new: dict, threshold: float) -> List[str]:
+    """p95 가 threshold% 넘게 느려진 항목 목록 (표는 바로 출력)"""
+    regressions = []
+    print(f"\n{'size':>6} {'scenario':<24} {'p50 ms':>17} {'p95 ms':>17} {'p99 ms':>17} {'rps':>15}")
+    for size, res in new["results"].items():
+        base = old.get("results", {}).get(size)
+        if not base:
+            continue
+        for name, cur in res["scenarios"].items():
+            prev = base["scenarios"].get(name)
+            if not prev:
+                continue
+            cells = []
+            for key in ("p50_ms", "p95_ms", "p99_ms", "throughput_rps"):
+                a, b = prev[key], cur[key]
+                pct = (b - a) / a * 100 if a else 0.0
+                cells.append(f"{b:>8.1f} ({pct:+5.0f}%)")
+            print(f"{size:>6} {name:<24} " + " ".join(cells))
+            a, b = prev["p95_ms"], cur["p95_ms"]
+            if a and (b - a) / a * 100 > threshold:
+                regressions.append(f"{size}/{name}: p95 {a:.1f} → {b:.1f} ms")
+        for key in ("catalog_load_ms", "peak_rss_mb"):
+            print(f"{size:>6} {key:<24} {base[key]:>8.1f} → {res[key]:.1f}")
+    return regressions
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"],
+                                       stderr=subprocess.DEVNULL, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--sizes", default="75,1000,10000", help="합성 카탈로그 템플릿 수 (쉼표 구분)")
+    ap.add_argument("--requests", type=int, default=200, help="시나리오별 요청 수")
+    ap.add_argument("--unknown-requests", type=int, default=20, help="GPT 폴백 키워드 요청 수")
+    ap.add_argument("--news-refreshes", type=int, default=3)
+    ap.add_argument("--threads", type=int, default=1, help="동시 요청 스레드 수")
+    ap.add_argument("--openai-latency", type=float, default=0.8, help="가짜 OpenAI 지연(초)")
+    ap.add_argument("--naver-latency", type=float, default=0.15)
+    ap.add_argument("--safetynews-latency", type=float, default=0.2)
+    ap.add_argument("--no-warm", action="store_true", help="XLSX 캐시 예열 생략")
+    ap.add_argument("--csv-only", action="store_true", help="컴파일된 카탈로그 없이 CSV 직접 파싱")
+    ap.add_argument("--no-prerender", action="store_true", help="XLSX 미리 렌더링 생략 (요청 시 렌더링)")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--out", default="benchmark.json")
+    ap.add_argument("--compare", help="비교할 이전 기준선 JSON")
+    ap.add_argument("--threshold", type=float, default=10.0, help="회귀로 볼 p95 증가율(%%)")
+    ap.add_argument("--max-resolve-growth", type=float, default=10.0,
+                    help="가장 작은/큰 카탈로그 사이 resolver 평균 조회 시간 허용 배수")
+    args = ap.parse_args()
+
+    opts = {
+        "requests": args.requests, "unknown_requests": args.unknown_requests,
+        "news_refreshes": args.news_refreshes, "threads": args.threads,
+        "warm": not args.no_warm, "compiled": not args.csv_only,
+        "prerender": not args.no_prerender, "seed": args.seed,
+    }
+    fake = FakeUpstreams(args.openai_latency, args.naver_latency, args.safetynews_latency)
+    report = {
+        "meta": {
+            "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "options": dict(opts, openai_latency=args.openai_latency,
+                            naver_latency=args.naver_latency,
+                            safetynews_latency=args.safetynews_latency),
+        },
+        "results": {},
+    }
+
+    # 카탈로그 크기마다 새 프로세스: 모듈 전역 캐시/RSS 가 서로 섞이지 않는다
+    ctx = multiprocessing.get_context("spawn")
+    try:
+        for size in [int(s) for s in args.sizes.split(",") if s.strip()]:
+            print(f"[bench] {size} templates ...", flush=True)
+            with ctx.Pool(1) as pool:
+                res = pool.apply(bench_size, (size, fake.url, opts))
+            report["results"][str(size)] = res
+            for name, s in res["scenarios"].items():
+                print(f"  {name:<24} p50 {s['p50_ms']:>9.1f}  p95 {s['p95_ms']:>9.1f}  "
+                      f"p99 {s['p99_ms']:>9.1f} ms  {s['throughput_rps']:>8.1f} rps  err {s['errors']}")
+            print(f"  catalog load {res['catalog_load_ms']} ms, peak RSS {res['peak_rss_mb']} MB")
+    finally:
+        report["meta"]["upstream_calls"] = dict(fake.calls)
+        fake.close()
+
+    scaling = resolve_scaling(report["results"], args.max_resolve_growth)
+    report["resolve_scaling_failures"] = scaling
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"[bench] saved → {args.out}")
+
+    regressions = list(scaling)
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            regressions += compare(json.load(f), report, args.threshold)
+    if regressions:
+        print("\n회귀:", *regressions, sep="\n  ")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,119 @@
+# capacity.py
+# 외부 호출(OpenAI/네이버/안전신문)에 묶이는 작업의 동시 실행 상한 (bulkhead).
+# gthread 워커의 스레드는 모든 라우트가 같이 쓰므로, 외부 호출을 기다리는 요청이
+# 차지할 수 있는 스레드 수(UPSTREAM_REQUEST_SLOTS)를 스레드 수보다 작게 두어
+# 나머지는 항상 템플릿 라우트 몫으로 남긴다. 자리가 없으면 줄 세우지 않고
+# 503 + Retry-After 로 바로 돌려보낸다. (값은 워커 프로세스별)
+
+import os
+import threading
+from contextlib import ExitStack, contextmanager
+
+from flask import Flask, jsonify
+
+from metrics import BULKHEAD_REJECTIONS
+
+
+class Overloaded(Exception):
+    """bulkhead 자리가 없을 때 → 503"""
+
+    def __init__(self, name: str, retry_after: int):
+        super().__init__(f"{name} 처리량 초과")
+        self.name = name
+        self.retry_after = retry_after
+
+
+class Bulkhead:
+    def __init__(self, name: str, limit: int, wait: float = 0.0, retry_after: int = 5):
+        self.name = name
+        self.limit = limit
+        self.wait = wait
+        self.retry_after = retry_after
+        self._sem = threading.BoundedSemaphore(limit)
+        self._lock = threading.Lock()
+        self.in_use = 0
+        self.rejected = 0
+
+    @contextmanager
+    def slot(self):
+        ok = self._sem.acquire(timeout=self.wait) if self.wait > 0 else self._sem.acquire(blocking=False)
+        if not ok:
+            with self._lock:
+                self.rejected += 1
+            BULKHEAD_REJECTIONS.inc(bulkhead=self.name)
+            raise Overloaded(self.name, self.retry_after)
+        with self._lock:
+            self.in_use += 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                self.in_use -= 1
+            self._sem.release()
+
+    def stats(self) -> dict:
+        return {"limit": self.limit, "in_use": self.in_use, "rejected": self.rejected}
+
+
+class SharedSlot:
+    """요청 하나의 여러 작업 스레드가 bulkhead 자리 하나를 나눠 쓴다.
+    처음 slot() 에 들어갈 때 자리를 잡고(없으면 Overloaded), with 블록이 끝날 때 놓는다."""
+
+    def __init__(self, bulkhead: Bulkhead):
+        self.bulkhead = bulkhead
+        self._lock = threading.Lock()
+        self._stack = ExitStack()
+        self._held = False
+
+    @contextmanager
+    def slot(self):
+        with self._lock:
+            if not self._held:
+                self._stack.enter_context(self.bulkhead.slot())
+                self._held = True
+        yield
+
+    def __enter__(self) -> "SharedSlot":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._stack.close()
+
+
+def _env_int(name: str, default: int) -> int:
+    return int(os.getenv(name, str(default)))
+
+
+# 외부 호출을 기다릴 수 있는 요청 스레드 수 (즉시 거절)
+upstream_requests = Bulkhead(
+    "upstream_requests", _env_int("UPSTREAM_REQUEST_SLOTS", 4),
+    retry_after=_env_int("UPSTREAM_RETRY_AFTER", 5),
+)
+# 업스트림별 동시 호출 수 (잠깐 기다려 본다)
+openai_calls = Bulkhead(
+    "openai", _env_int("OPENAI_CONCURRENCY", 4),
+    wait=float(os.getenv("OPENAI_QUEUE_WAIT", "2")), retry_after=_env_int("UPSTREAM_RETRY_AFTER", 5),
+)
+naver_calls = Bulkhead("naver", _env_int("NAVER_CONCURRENCY", 4), wait=10)
+safetynews_calls = Bulkhead("safetynews", _env_int("SAFETYNEWS_CONCURRENCY", 4), wait=10)
+
+OPENAI_TIMEOUT = float(os.getenv("OPENAI_TIMEOUT", "30"))
+NAVER_TIMEOUT = float(os.getenv("NAVER_TIMEOUT", "5"))
+SAFETYNEWS_TIMEOUT = float(os.getenv("SAFETYNEWS_TIMEOUT", "10"))
+
+BULKHEADS = [upstream_requests, openai_calls, naver_calls, safetynews_calls]
+
+
+def capacity_stats() -> dict:
+    return {b.name: b.stats() for b in BULKHEADS}
+
+
+# ── Flask 연동 ────────────────────────────────────────────────────────────────
+def init_capacity(app: Flask) -> None:
+    @app.errorhandler(Overloaded)
+    def _overloaded(e: Overloaded):
+        resp = jsonify(error="요청이 많아 잠시 처리할 수 없습니다. 잠시 후 다시 시도해 주세요.",
+                       bulkhead=e.name)
+        resp.status_code = 503
+        resp.headers["Retry-After"] = str(e.retry_after)
+        return resp
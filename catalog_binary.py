@@ -0,0 +1,167 @@
+# catalog_binary.py
+# 컴파일된 템플릿 카탈로그(.catalog) 형식: 쓰기 + mmap 읽기.
+# 모든 문자열은 한 번만 저장(intern)하고 행/별칭은 문자열 번호로만 가리킨다.
+# 파일을 mmap 으로 열어 두면 행은 요청 시점에 필요한 템플릿 것만 디코딩하고,
+# 페이지는 같은 파일을 연 워커 프로세스끼리 OS 가 공유한다.
+#
+#   헤더(원본 CSV sha1 + 빌더 리비전) | 문자열 오프셋[n_strings+1] | 문자열 UTF-8 blob
+#        | 템플릿[n_templates] (이름, 빈도, 행 시작, 행 수)
+#        | 행[n_rows][열 수] (문자열 번호, 빈 셀은 NONE_ID)
+#        | 별칭[n_aliases] (키 문자열 번호, 템플릿 번호) — 키 정렬 순
+
+import os
+import sys
+import mmap
+import struct
+from array import array
+from typing import Dict, List, Optional, Sequence, Tuple
+
+MAGIC = b"XCATALOG"
+FORMAT_VERSION = 2
+NONE_ID = 0xFFFFFFFF
+# magic, 형식 버전, 열 수, 문자열/템플릿/행/별칭 개수, 원본 CSV sha1, 빌더 리비전 sha1, 섹션 오프셋 5개
+_HEADER = struct.Struct("<8sIIIIII40s40s5Q")
+
+
+class CompiledCatalogError(Exception):
+    """컴파일된 카탈로그를 읽을 수 없을 때 (CSV 로 대신 읽는다)"""
+
+
+def _u32(values) -> bytes:
+    a = array("I", values)
+    if sys.byteorder != "little":
+        a.byteswap()
+    return a.tobytes()
+
+
+# ── 쓰기 ──────────────────────────────────────────────────────────────────────
+def write_compiled(path: str, source_version: str, columns: Sequence[str],
+                   templates: List[str], freq: Dict[str, int],
+                   rows: Dict[str, List[Tuple]], alias_map: Dict[str, str],
+                   builder: str) -> dict:
+    """카탈로그를 임시 파일에 쓰고 원자적으로 교체 → 통계
+    (builder: 만든 코드의 리비전 — 별칭 규칙 등이 바뀌면 읽는 쪽이 거부한다)"""
+    ids: Dict[str, int] = {}
+    strings: List[bytes] = []
+
+    def intern(s: Optional[str]) -> int:
+        if s is None:
+            return NONE_ID
+        i = ids.get(s)
+        if i is None:
+            i = ids[s] = len(strings)
+            strings.append(s.encode("utf-8"))
+        return i
+
+    tpl_index = {t: i for i, t in enumerate(templates)}
+    tpl_recs, row_ids, start = [], [], 0
+    for t in templates:
+        trows = rows.get(t, [])
+        tpl_recs += [intern(t), freq.get(t, 0), start, len(trows)]
+        for r in trows:
+            row_ids += [intern(None if v is None else str(v)) for v in r]
+        start += len(trows)
+    alias_recs = []
+    for key in sorted(alias_map):
+        alias_recs += [intern(key), tpl_index[alias_map[key]]]
+
+    offsets, pos = [], 0
+    for s in strings:
+        offsets.append(pos)
+        pos += len(s)
+    offsets.append(pos)
+
+    sections = [_u32(offsets), b"".join(strings), _u32(tpl_recs), _u32(row_ids), _u32(alias_recs)]
+    section_offsets, pos = [], _HEADER.size
+    for sec in sections:
+        pad = -pos % 8
+        section_offsets.append(pos + pad)
+        pos += pad + len(sec)
+    header = _HEADER.pack(
+        MAGIC, FORMAT_VERSION, len(columns), len(strings), len(templates), start,
+        len(alias_map), source_version.encode("ascii"), builder.encode("ascii"), *section_offsets
+    )
+
+    tmp = f"{path}.tmp{os.getpid()}"
+    with open(tmp, "wb") as f:
+        f.write(header)
+        for off, sec in zip(section_offsets, sections):
+            f.write(b"\0" * (off - f.tell()))
+            f.write(sec)
+    os.replace(tmp, path)
+    return {"strings": len(strings), "templates": len(templates), "rows": start,
+            "aliases": len(alias_map), "bytes": os.path.getsize(path)}
+
+
+# ── 읽기 (mmap) ───────────────────────────────────────────────────────────────
+class CompiledCatalog:
+    def __init__(self, path: str):
+        if sys.byteorder != "little":
+            raise CompiledCatalogError("big-endian 플랫폼은 지원하지 않습니다.")
+        with open(path, "rb") as f:
+            try:
+                self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:  # 빈 파일
+                raise CompiledCatalogError(f"빈 카탈로그 파일: {path}")
+        if len(self._mm) < _HEADER.size:
+            raise CompiledCatalogError(f"손상된 카탈로그 파일: {path}")
+        (magic, fmt, self.n_columns, n_strings, n_templates, n_rows, n_aliases,
+         source, builder, *offs) = _HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC or fmt != FORMAT_VERSION:
+            raise CompiledCatalogError(f"카탈로그 형식이 다릅니다: {path}")
+        self.path = path
+        self.source_version = source.decode("ascii")
+        self.builder = builder.decode("ascii")
+
+        buf = memoryview(self._mm)
+        self._str_off = buf[offs[0]:offs[0] + (n_strings + 1) * 4].cast("I")
+        self._blob = offs[1]
+        self._tpls = buf[offs[2]:offs[2] + n_templates * 16].cast("I")
+        self._rows = buf[offs[3]:offs[3] + n_rows * self.n_columns * 4].cast("I")
+        self._aliases = buf[offs[4]:offs[4] + n_aliases * 8].cast("I")
+        self.n_templates = n_templates
+
+    def string(self, i: int) -> Optional[str]:
+        if i == NONE_ID:
+            return None
+        start = self._blob + self._str_off[i]
+        end = self._blob + self._str_off[i + 1]
+        return self._mm[start:end].decode("utf-8")
+
+    def strings(self, ids: Sequence[int]) -> List[str]:
+        """여러 문자열을 한 번에 (NONE_ID 없음을 가정한 빠른 경로)"""
+        mm, off, base = self._mm, self._str_off, self._blob
+        return [mm[base + off[i]:base + off[i + 1]].decode("utf-8") for i in ids]
+
+    def templates(self) -> List[str]:
+        return self.strings(self._tpls.tolist()[0::4])
+
+    def freq(self) -> List[int]:
+        return self._tpls.tolist()[1::4]
+
+    def aliases(self) -> List[Tuple[str, int]]:
+        """(키, 템플릿 번호) — 키 정렬 순"""
+        a = self._aliases.tolist()
+        return list(zip(self.strings(a[0::2]), a[1::2]))
+
+    def rows(self, tpl_index: int) -> List[Tuple]:
+        start, count = self._tpls[tpl_index * 4 + 2], self._tpls[tpl_index * 4 + 3]
+        n = self.n_columns
+        ids = self._rows[start * n:(start + count) * n]
+        return [tuple(self.string(ids[j]) for j in range(k, k + n)) for k in range(0, len(ids), n)]
+
+
+def open_compiled(path: str, source_version: Optional[str] = None,
+                  builder: Optional[str] = None) -> Optional[CompiledCatalog]:
+    """파일이 없거나, 형식이 다르거나, 원본 CSV 버전·빌더 리비전과 다르면 None"""
+    if not path or not os.path.exists(path):
+        return None
+    try:
+        compiled = CompiledCatalog(path)
+    except (OSError, CompiledCatalogError, struct.error):
+        return None
+    if source_version is not None and compiled.source_version != source_version:
+        return None
+    if builder is not None and compiled.builder != builder:
+        return None
+    return compiled
@@ -0,0 +1,66 @@
+# catalog_build.py
+# 빌드 단계: 통합_노지파일.csv → 검사 → 컴파일된 카탈로그(.catalog) → XLSX 미리 렌더링.
+# 워커는 .catalog 를 mmap 으로 열어 pandas 없이, CSV 파싱·별칭 생성 없이 바로 뜨고,
+# 미리 렌더링된 XLSX(data/xlsx)는 디스크에서 그대로 보낸다.
+# CSV 나 별칭 규칙(BUILDER_REVISION)이 바뀌면 다시 빌드해야 하며,
+# 그 전까지 서버는 CSV 를 직접 파싱·렌더링한다.
+#
+#   python catalog_build.py
+#   python catalog_build.py --csv 다른.csv --out data/다른.catalog --xlsx-dir data/다른_xlsx
+#   python catalog_build.py --strict          # 검사 오류가 있으면 빌드 실패
+#   python catalog_build.py --no-prerender    # .catalog 만
+
+import sys
+import time
+import hashlib
+import argparse
+
+from catalog_binary import write_compiled
+from catalog_validate import print_report, validate
+from template_catalog import (
+    BUILDER_REVISION, CATALOG_PATH, COMPILED_CATALOG_PATH, OUTPUT_COLUMNS,
+    CatalogSnapshot, apply_curated_aliases, build_alias_map, parse_catalog_csv
+)
+from xlsx_prebuilt import PREBUILT_DIR, prerender
+
+
+def build(csv_path: str, out_path: str) -> dict:
+    with open(csv_path, "rb") as f:
+        raw = f.read()
+    templates, freq, rows = parse_catalog_csv(raw)
+    alias_map = apply_curated_aliases(build_alias_map(templates), templates)
+    return write_compiled(out_path, hashlib.sha1(raw).hexdigest(), OUTPUT_COLUMNS,
+                          templates, freq, rows, alias_map, BUILDER_REVISION)
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--csv", default=CATALOG_PATH)
+    ap.add_argument("--out", default=COMPILED_CATALOG_PATH)
+    ap.add_argument("--xlsx-dir", default=PREBUILT_DIR)
+    ap.add_argument("--workers", type=int, default=None, help="렌더링 프로세스 수 (기본: CPU 수)")
+    ap.add_argument("--strict", action="store_true", help="검사 오류가 있으면 실패")
+    ap.add_argument("--no-prerender", action="store_true")
+    args = ap.parse_args()
+
+    with open(args.csv, "rb") as f:
+        raw = f.read()
+    report = validate(raw)
+    print_report(report)
+    if args.strict and report.errors:
+        sys.exit(1)
+
+    t0 = time.perf_counter()
+    stats = build(args.csv, args.out)
+    print(f"{args.out}: 템플릿 {stats['templates']}개, 행 {stats['rows']}개, "
+          f"별칭 {stats['aliases']}개, 문자열 {stats['strings']}개, "
+          f"{stats['bytes'] / 1024:.1f} KiB ({(time.perf_counter() - t0) * 1000:.0f} ms)")
+
+    if not args.no_prerender:
+        t0 = time.perf_counter()
+        snap = CatalogSnapshot.from_csv(raw, hashlib.sha1(raw).hexdigest())
+        summary = {"errors": len(report.errors), "warnings": len(report.warnings)}
+        p = prerender(snap, args.xlsx_dir, args.workers, extra={"validation": summary})
+        print(f"{args.xlsx_dir}: 템플릿 {p['templates']}개 → 파일 {p['files']}개 "
+              f"(새로 렌더링 {p['rendered']}개, {p['rendered_bytes'] / 1024:.1f} KiB, 정리 {p['removed']}개, "
+              f"{(time.perf_counter() - t0) * 1000:.0f} ms)")
@@ -0,0 +1,170 @@
+# catalog_validate.py
+# 통합_노지파일.csv 품질 검사 (빌드 단계에서 실행, 서버는 쓰지 않는다).
+#   - 행: 템플릿명이 빈 행(여러 줄 셀이 잘려 생긴 잔여 행), 열 수가 다른 행,
+#         출력 열이 모두 빈 행, 줄바꿈/따옴표/앞뒤 공백이 섞인 템플릿명
+#   - 이름: 정규화(sanitize)하면 같아지는 템플릿명 (크레인 작업계획서 / 크레인작업계획서)
+#   - 별칭: build_alias_map 에서 한 키에 여러 템플릿이 등록돼 나중 것이 이기는 경우,
+#           수기 별칭(CURATED_ALIASES)에서 같은 키가 두 번 이상 등록된 경우
+#
+#   python catalog_validate.py [--csv 다른.csv] [--strict]
+
+import sys
+import csv
+import argparse
+from io import StringIO
+from typing import Dict, List, Set
+
+from keyword_resolver import normalize_query
+from template_catalog import (
+    CATALOG_PATH, OUTPUT_COLUMNS, CURATED_ALIASES,
+    alias_candidates, parse_catalog_csv, sanitize
+)
+
+ERROR = "error"
+WARNING = "warning"
+
+
+class ValidationReport:
+    def __init__(self):
+        self.issues: List[dict] = []
+        self.stats: dict = {}
+
+    def add(self, level: str, kind: str, message: str, **detail) -> None:
+        self.issues.append({"level": level, "kind": kind, "message": message, **detail})
+
+    @property
+    def errors(self) -> List[dict]:
+        return [i for i in self.issues if i["level"] == ERROR]
+
+    @property
+    def warnings(self) -> List[dict]:
+        return [i for i in self.issues if i["level"] == WARNING]
+
+    def to_dict(self) -> dict:
+        return {"stats": self.stats, "errors": len(self.errors),
+                "warnings": len(self.warnings), "issues": self.issues}
+
+
+# ── 행 단위 검사 ──────────────────────────────────────────────────────────────
+def _check_rows(raw: bytes, report: ValidationReport) -> None:
+    reader = csv.reader(StringIO(raw.decode("utf-8-sig"), newline=""))
+    header = next(reader, None) or []
+    name_i = header.index("템플릿명")
+    cols = [header.index(c) for c in OUTPUT_COLUMNS if c in header]
+    missing = [c for c in OUTPUT_COLUMNS if c not in header]
+    if missing:
+        report.add(ERROR, "missing_column", f"출력 열이 없습니다: {', '.join(missing)}")
+
+    blank_lines: List[int] = []
+    bad_names: Dict[str, int] = {}
+    for rec in reader:
+        line = reader.line_num
+        if not any(c.strip() for c in rec):
+            continue
+        if len(rec) != len(header):
+            report.add(WARNING, "column_count",
+                       f"{line}행: 열 {len(rec)}개 (헤더 {len(header)}개)", line=line)
+        name = rec[name_i] if name_i < len(rec) else ""
+        if not name.strip():
+            blank_lines.append(line)
+            continue
+        if name != name.strip() or "\n" in name or '"' in name:
+            bad_names.setdefault(name, line)
+        if all(c >= len(rec) or not rec[c].strip() for c in cols):
+            report.add(WARNING, "empty_row", f"{line}행: '{name}' 의 출력 열이 모두 비어 있습니다.",
+                       line=line, template=name)
+
+    if blank_lines:
+        # 서버는 이 행들을 버린다 — 앞 템플릿의 여러 줄 셀이 잘렸을 가능성이 크다
+        report.add(WARNING, "blank_name",
+                   f"템플릿명이 빈 행 {len(blank_lines)}개 (처음: {blank_lines[0]}행)",
+                   lines=blank_lines)
+    for name, line in bad_names.items():
+        report.add(ERROR, "stray_name",
+                   f"{line}행: 템플릿명에 줄바꿈/따옴표/앞뒤 공백이 있습니다: {name!r}",
+                   line=line, template=name)
+
+
+# ── 이름 / 별칭 검사 ──────────────────────────────────────────────────────────
+def _check_names(templates: List[str], report: ValidationReport) -> None:
+    by_norm: Dict[str, List[str]] = {}
+    for t in templates:
+        by_norm.setdefault(sanitize(t), []).append(t)
+    for norm, names in by_norm.items():
+        if len(names) > 1:
+            report.add(ERROR, "near_duplicate",
+                       f"정규화하면 같은 템플릿명: {' / '.join(names)}", key=norm, templates=names)
+
+    known = set(by_norm)
+    curated: Dict[str, List[tuple]] = {}
+    for key, target in CURATED_ALIASES:
+        # resolver 가 조회하는 접미사 뗀 키로도 모은다
+        for norm in dict.fromkeys((sanitize(key), normalize_query(key)[1])):
+            curated.setdefault(norm, []).append((key, target))
+        if sanitize(target) not in known:
+            report.add(WARNING, "curated_target",
+                       f"수기 별칭 '{key}' 의 대상 '{target}' 이 카탈로그에 없습니다.",
+                       key=key, target=target)
+    # 정규화하면 같은 키는 먼저 나온 것만 쓰인다 (apply_curated_aliases)
+    for norm, entries in curated.items():
+        targets = list(dict.fromkeys(sanitize(t) for _, t in entries))
+        if len(targets) > 1:
+            report.add(ERROR, "curated_duplicate",
+                       f"수기 별칭 키 '{norm}' 이 여러 대상에 등록됨: "
+                       + ", ".join(f"'{k}' → '{t}'" for k, t in entries),
+                       key=norm, targets=[t for _, t in entries])
+        elif len(entries) > 1 and len({k for k, _ in entries}) < len(entries):
+            report.add(WARNING, "curated_duplicate",
+                       f"수기 별칭 '{entries[0][0]}' 이 {len(entries)}번 등록됨", key=norm)
+
+
+def _check_aliases(templates: List[str], report: ValidationReport) -> Dict[str, str]:
+    claims: Dict[str, List[str]] = {}
+    for key, tpl in alias_candidates(templates):
+        owners = claims.setdefault(key, [])
+        if tpl not in owners:
+            owners.append(tpl)
+    # 템플릿명 그 자체(정규화 포함)가 다른 템플릿에 빼앗기면 정확 일치로도 못 찾는다
+    own_keys: Set[str] = {t.lower() for t in templates} | {sanitize(t) for t in templates}
+    for key, owners in claims.items():
+        if len(owners) < 2:
+            continue
+        level = ERROR if key in own_keys else WARNING
+        report.add(level, "alias_collision",
+                   f"별칭 '{key}' → {len(owners)}개 템플릿 ({' / '.join(owners)}), '{owners[-1]}' 로 등록됨",
+                   key=key, templates=owners, winner=owners[-1])
+    return {k: v[-1] for k, v in claims.items()}
+
+
+def validate(raw: bytes) -> ValidationReport:
+    report = ValidationReport()
+    templates, freq, _ = parse_catalog_csv(raw)  # '템플릿명' 열이 없으면 CatalogError
+    _check_rows(raw, report)
+    _check_names(templates, report)
+    alias = _check_aliases(templates, report)
+    report.stats = {"templates": len(templates), "rows": sum(freq.values()), "aliases": len(alias)}
+    return report
+
+
+def print_report(report: ValidationReport, limit: int = 20, out=sys.stdout) -> None:
+    s = report.stats
+    print(f"템플릿 {s['templates']}개, 행 {s['rows']}개, 별칭 {s['aliases']}개 — "
+          f"오류 {len(report.errors)}건, 경고 {len(report.warnings)}건", file=out)
+    for level, issues in ((ERROR, report.errors), (WARNING, report.warnings)):
+        for i in issues[:limit]:
+            print(f"  [{level}] {i['message']}", file=out)
+        if len(issues) > limit:
+            print(f"  ... {level} {len(issues) - limit}건 더", file=out)
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--csv", default=CATALOG_PATH)
+    ap.add_argument("--strict", action="store_true", help="경고도 실패로 처리")
+    ap.add_argument("--limit", type=int, default=20, help="종류별 출력 건수")
+    args = ap.parse_args()
+
+    with open(args.csv, "rb") as f:
+        report = validate(f.read())
+    print_report(report, args.limit)
+    sys.exit(1 if report.errors or (args.strict and report.warnings) else 0)
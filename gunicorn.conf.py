@@ -0,0 +1,47 @@
+# gunicorn.conf.py
+# 카탈로그/캐시를 마스터에서 미리 올린 뒤(preload) 워커를 fork 해 COW 로 공유한다.
+
+import os
+import gc
+import fcntl
+
+bind = f"0.0.0.0:{os.getenv('PORT', '10000')}"
+workers = int(os.getenv("WEB_CONCURRENCY", "2"))
+worker_class = "gthread"
+# 외부 호출을 기다리는 요청은 capacity.UPSTREAM_REQUEST_SLOTS 개까지만 스레드를 잡고
+# 나머지 스레드는 템플릿 라우트 몫으로 남는다 (슬롯 수보다 넉넉히 크게)
+threads = int(os.getenv("GUNICORN_THREADS", "8"))
+# 워커당 받아 두는 연결 수 상한 (무한정 줄 세우지 않음)
+worker_connections = int(os.getenv("GUNICORN_WORKER_CONNECTIONS", "64"))
+backlog = int(os.getenv("GUNICORN_BACKLOG", "128"))
+preload_app = True
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "60"))
+graceful_timeout = 30
+keepalive = 5
+max_requests = int(os.getenv("GUNICORN_MAX_REQUESTS", "2000"))
+max_requests_jitter = 200
+accesslog = "-"
+
+_scheduler_lock = None
+
+
+def pre_fork(server, worker):
+    # 미리 올린 객체를 GC 대상에서 빼서 워커에서 참조만으로 페이지가 복사되지 않게
+    gc.freeze()
+
+
+def post_fork(server, worker):
+    # 뉴스 수집 스케줄러는 파일 잠금을 잡은 워커 하나에서만 (그 워커가 죽으면 다음 워커가 이어받음)
+    global _scheduler_lock
+    if os.getenv("NEWS_SCHEDULER", "1") != "1":
+        return
+    from template_catalog import DATA_DIR
+    f = open(os.path.join(DATA_DIR, ".news_scheduler.lock"), "w")
+    try:
+        fcntl.flock(f, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        f.close()
+        return
+    _scheduler_lock = f
+    from news_scheduler import start_news_scheduler
+    start_news_scheduler()
@@ -0,0 +1,200 @@
+# keyword_resolver.py
+# 카탈로그 버전당 한 번 만드는 키워드 → 템플릿 resolver.
+# 기존 resolve_keyword 의 8단계 규칙을 따르지만, 매 요청마다 템플릿 전체를 훑는 대신
+# 미리 만든 인덱스(접두사 트라이, 문자 n-gram 역색인, 빈도 순위)를 쓴다.
+# 퍼지 단계만은 2-gram 을 충분히 공유하는 후보 안에서 채점하므로 기존과 결과가 다를 수 있다.
+
+import re
+import difflib
+import heapq
+from collections import Counter
+from typing import Dict, List, Optional, Set, Tuple
+
+from template_catalog import sanitize
+
+# 1) 접미사형 동사 제거용 패턴
+_REQUEST_SUFFIX = re.compile(
+    r"\s*(?:양식|서식|점검표|계획서|표)(?:을|를)?\s*"
+    r"(?:주세요|줘|달라|해주세요|전달)?$",
+    flags=re.IGNORECASE
+)
+
+FUZZY_N = 3
+FUZZY_CUTOFF = 0.6
+# 퍼지 후보: 오타 한두 개로 깨지는 것 이상의 2-gram 을 공유하는 템플릿 중
+# 겹침 비율(공유 수 / 양쪽 길이)이 높은 몇 개만 difflib 으로 채점한다.
+# FUZZY_MAX_POSTING 개(큰 카탈로그에서는 템플릿의 1/8)보다 많은 템플릿에 나오는 2-gram 은
+# 후보를 만드는 데 쓰지 않는다.
+FUZZY_MAX_CANDIDATES = 32
+FUZZY_MAX_POSTING = 1024
+
+
+def normalize_query(raw: str) -> Tuple[str, str]:
+    """(접미사 제거 후 소문자, sanitize 결과)"""
+    r = _REQUEST_SUFFIX.sub("", raw.strip()).lower()
+    return r, sanitize(r)
+
+
+def _gram_index(names: List[str]) -> Dict[str, Set[int]]:
+    """1-gram + 2-gram → 템플릿 인덱스 집합"""
+    index: Dict[str, Set[int]] = {}
+    for i, name in enumerate(names):
+        for j, ch in enumerate(name):
+            index.setdefault(ch, set()).add(i)
+            if j + 1 < len(name):
+                index.setdefault(name[j:j + 2], set()).add(i)
+    return index
+
+
+class KeywordResolver:
+    def __init__(self, templates: List[str], alias_map: dict, freq: dict):
+        self.templates = list(templates)
+        self.alias_map = alias_map
+        self._freq = freq
+        n = len(self.templates)
+
+        self._lower = [t.lower() for t in self.templates]
+        self._norms = [sanitize(t) for t in self.templates]
+        self._norm_lens = [len(x) for x in self._norms]
+
+        # 빈도 순위: 빈도 내림차순, 동률이면 정렬 순서 (max() 의 동률 처리와 동일)
+        order = sorted(range(n), key=lambda i: (-freq.get(self.templates[i], 0), i))
+        self._rank = [0] * n
+        for r, i in enumerate(order):
+            self._rank[i] = r
+        self._best = order[0] if order else None
+
+        # 토큰/부분문자열 매칭용 n-gram 역색인
+        self._lower_grams = _gram_index(self._lower)
+        self._norm_grams = _gram_index(self._norms)
+        self._max_posting = max(FUZZY_MAX_POSTING, n // 8)
+
+        # 접두사 트라이: 노드 = [하위 최고 순위 템플릿, {문자: 자식}]
+        self._trie = [self._best, {}]
+        for i, norm in enumerate(self._norms):
+            node = self._trie
+            for ch in norm:
+                child = node[1].get(ch)
+                if child is None:
+                    child = node[1][ch] = [i, {}]
+                elif self._rank[i] < self._rank[child[0]]:
+                    child[0] = i
+                node = child
+
+        self._first_by_norm: Dict[str, int] = {}
+        for i, norm in enumerate(self._norms):
+            self._first_by_norm.setdefault(norm, i)
+
+    # ── 내부 헬퍼 ────────────────────────────────────────────────────────────
+    def _pick_max(self, cands) -> str:
+        return self.templates[min(cands, key=self._rank.__getitem__)]
+
+    @staticmethod
+    def _substr(grams: Dict[str, Set[int]], names: List[str], q: str) -> Set[int]:
+        if len(q) == 1:
+            return set(grams.get(q, ()))
+        postings = []
+        for j in range(len(q) - 1):
+            p = grams.get(q[j:j + 2])
+            if not p:
+                return set()
+            postings.append(p)
+        postings.sort(key=len)
+        cands = set(postings[0]).intersection(*postings[1:])
+        return {i for i in cands if q in names[i]}
+
+    def _fuzzy_candidates(self, cleaned: str) -> List[int]:
+        """질의와 2-gram 을 충분히 공유하는 템플릿 중 겹침 비율 상위 FUZZY_MAX_CANDIDATES 개"""
+        grams = self._norm_grams
+        qgrams = list(dict.fromkeys(cleaned[j:j + 2] for j in range(len(cleaned) - 1))) or [cleaned]
+        # 너무 흔한 2-gram('작업' 등)은 후보를 가르지 못하고 세는 비용만 크다
+        probe = [g for g in qgrams if len(grams.get(g, ())) <= self._max_posting] or qgrams
+        # 글자 하나가 바뀌거나 자리가 바뀌면 2-gram 이 최대 3개 깨진다
+        need = max(1, min(len(probe) - 3, (len(probe) + 1) // 2))
+        shared = Counter()
+        for g in probe:
+            shared.update(grams.get(g, ()))
+
+        # 길이 상한: ratio = 2M/(lq+lx) 이고 M <= min(lq, lx) (difflib real_quick_ratio 와 같은 식)
+        lq, nq = len(cleaned), len(probe)
+        lens = self._norm_lens
+        scored = [(-n / (nq + lens[i]), i) for i, n in shared.items() if n >= need
+                  and 2.0 * min(lq, lens[i]) / (lq + lens[i]) >= FUZZY_CUTOFF]
+        return [i for _, i in heapq.nsmallest(FUZZY_MAX_CANDIDATES, scored)]
+
+    def _fuzzy(self, cleaned: str) -> List[str]:
+        s = difflib.SequenceMatcher()
+        s.set_seq2(cleaned)
+        top: List[Tuple[float, str]] = []  # (점수, 이름) 최소 힙, 최대 FUZZY_N 개
+        for i in self._fuzzy_candidates(cleaned):
+            x = self._norms[i]
+            s.set_seq1(x)
+            # 상한이 지금의 FUZZY_N 위 점수보다 낮으면 ratio() 를 계산할 필요가 없다
+            floor = top[0][0] if len(top) == FUZZY_N else FUZZY_CUTOFF
+            if s.real_quick_ratio() < floor or s.quick_ratio() < floor:
+                continue
+            score = s.ratio()
+            if score < FUZZY_CUTOFF:
+                continue
+            if len(top) < FUZZY_N:
+                heapq.heappush(top, (score, x))
+            elif (score, x) > top[0]:
+                heapq.heapreplace(top, (score, x))
+        return [x for _, x in sorted(top, reverse=True)]
+
+    # ── 조회 ────────────────────────────────────────────────────────────────
+    def resolve_with_step(self, raw: str) -> Tuple[str, str]:
+        """(템플릿명, 매칭 단계) — 매칭 실패 시 ValueError"""
+        r, cleaned = normalize_query(raw)
+
+        # 2) alias_map 직접 조회
+        if cleaned in self.alias_map:
+            return self.alias_map[cleaned], "alias"
+
+        # 3) FORCE JSA/LOTO
+        if "jsa" in cleaned and "jsa" in self.alias_map:
+            return self.alias_map["jsa"], "force"
+        if "loto" in cleaned and "loto" in self.alias_map:
+            return self.alias_map["loto"], "force"
+
+        # 4) 토큰 매칭 (모든 토큰이 템플릿명에 포함)
+        tokens = [t for t in r.split() if t]
+        if not tokens:
+            if self._best is not None:
+                return self.templates[self._best], "token"
+        else:
+            cands: Optional[Set[int]] = None
+            for tok in sorted(tokens, key=len, reverse=True):
+                hit = self._substr(self._lower_grams, self._lower, tok)
+                cands = hit if cands is None else cands & hit
+                if not cands:
+                    break
+            if cands:
+                return self._pick_max(cands), "token"
+
+        # 5) 접두사 매칭
+        node = self._trie
+        for ch in cleaned:
+            node = node[1].get(ch)
+            if node is None:
+                break
+        if node is not None and node[0] is not None:
+            return self.templates[node[0]], "prefix"
+
+        # 6) 부분문자열 매칭
+        if cleaned:
+            cands = self._substr(self._norm_grams, self._norms, cleaned)
+            if cands:
+                return self._pick_max(cands), "substring"
+
+        # 7) 퍼지 매칭 (2-gram 후보 안에서 difflib.get_close_matches 와 같은 점수·순서)
+        matches = self._fuzzy(cleaned) if cleaned else []
+        if matches:
+            cands = [self.templates[self._first_by_norm[m]] for m in matches]
+            return max(cands, key=lambda t: self._freq.get(t, 0)), "fuzzy"
+
+        # 8) 매칭 실패
+        raise ValueError(f"템플릿 '{raw}'을(를) 찾을 수 없습니다.")
+
+    def resolve(self, raw: str) -> str:
+        return self.resolve_with_step(raw)[0]
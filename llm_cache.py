@@ -0,0 +1,254 @@
+# llm_cache.py
+# OpenAI 응답을 SQLite 에 저장해 두는 LLM 캐시.
+# 키 = 정규화한 프롬프트 + 모델 + 파라미터 해시. TTL 과 총 바이트 상한(LRU)으로
+# 정리하며, 같은 키의 동시 요청은 한 번만 호출하고 나머지는 그 결과를 기다린다.
+
+import os
+import re
+import json
+import time
+import hashlib
+import logging
+import sqlite3
+import threading
+import unicodedata
+from concurrent.futures import Future, TimeoutError as FutureTimeout
+from contextlib import nullcontext
+from typing import Callable, ContextManager, Dict, List, Optional, Tuple
+
+import openai
+
+from template_catalog import DATA_DIR, OUTPUT_COLUMNS
+from metrics import CACHE_REQUESTS, span, upstream_call
+from capacity import OPENAI_TIMEOUT, Overloaded, openai_calls
+from sqlite_store import SQLiteBacked
+
+logger = logging.getLogger(__name__)
+
+LLM_CACHE_PATH = os.path.join(DATA_DIR, "llm_cache.db")
+# 엑셀 셀로 그대로 쓸 수 있는 값 (목록/객체는 openpyxl 이 렌더링하지 못한다)
+CELL_TYPES = (str, int, float, type(None))
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS llm_cache (
+    key        TEXT PRIMARY KEY,
+    model      TEXT NOT NULL,
+    response   TEXT NOT NULL,
+    size       INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    expires_at REAL NOT NULL,
+    last_used  REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_llm_cache_last_used ON llm_cache(last_used);
+CREATE TABLE IF NOT EXISTS promoted_templates (
+    key        TEXT PRIMARY KEY,
+    name       TEXT NOT NULL,
+    rows       TEXT NOT NULL,
+    created_at REAL NOT NULL
+);
+"""
+
+
+def normalize_prompt(text: str) -> str:
+    """캐시 키용: 유니코드 정규화 + 소문자 + 공백 정리"""
+    return re.sub(r"\s+", " ", unicodedata.normalize("NFKC", text)).strip().lower()
+
+
+def cache_key(model: str, messages: List[dict], params: dict) -> str:
+    payload = {
+        "model": model,
+        "messages": [[m["role"], normalize_prompt(m["content"])] for m in messages],
+        "params": params,
+    }
+    return hashlib.sha256(json.dumps(payload, ensure_ascii=False, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+class CoalescedWaitTimeout(Exception):
+    """같은 키로 진행 중인 호출의 결과를 wait 초 안에 받지 못했을 때"""
+
+
+# ── LLM 응답 캐시 ─────────────────────────────────────────────────────────────
+class LLMCache(SQLiteBacked):
+    SCHEMA = _SCHEMA
+
+    def __init__(self, path: str = LLM_CACHE_PATH, ttl: float = 7 * 86400,
+                 max_bytes: int = 16 * 1024 * 1024):
+        super().__init__(path)
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._inflight: Dict[str, Future] = {}
+        self._inflight_lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    def get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            db = self._db()
+            row = db.execute(
+                "SELECT response, expires_at FROM llm_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            if row[1] <= now:
+                db.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                db.commit()
+                return None
+            db.execute("UPDATE llm_cache SET last_used = ? WHERE key = ?", (now, key))
+            db.commit()
+            return row[0]
+
+    def put(self, key: str, model: str, response: Optional[str], ttl: Optional[float] = None) -> None:
+        if response is None:  # 내용 없는 응답(필터링 등)은 저장하지 않는다
+            return
+        now = time.time()
+        size = len(response.encode("utf-8"))
+        with self._lock:
+            db = self._db()
+            db.execute(
+                "INSERT OR REPLACE INTO llm_cache "
+                "(key, model, response, size, created_at, expires_at, last_used) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, model, response, size, now, now + (self.ttl if ttl is None else ttl), now)
+            )
+            self._evict(db, now)
+            db.commit()
+
+    def _evict(self, db: sqlite3.Connection, now: float) -> None:
+        db.execute("DELETE FROM llm_cache WHERE expires_at <= ?", (now,))
+        total = db.execute("SELECT COALESCE(SUM(size), 0) FROM llm_cache").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for key, size in db.execute(
+            "SELECT key, size FROM llm_cache ORDER BY last_used"
+        ).fetchall():
+            db.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    def get_or_call(self, key: str, model: str, call: Callable[[], str],
+                    ttl: Optional[float] = None,
+                    cacheable: Optional[Callable[[str], bool]] = None,
+                    gate: Optional[Callable[[], ContextManager]] = None,
+                    wait: Optional[float] = None) -> Tuple[str, bool]:
+        """(응답, 캐시 적중 여부) — 같은 키의 동시 호출은 하나로 합친다.
+        cacheable 이 주어지면 그것이 참인 응답만 저장한다. gate 는 캐시에 없을 때
+        호출하는 쪽과 그 결과를 기다리는 쪽 모두가 잡는 자리, wait 는 기다리는 쪽의
+        최대 대기 시간(초과 시 CoalescedWaitTimeout)."""
+        cached = self.get(key)
+        if cached is not None:
+            self.hits += 1
+            return cached, True
+
+        with self._inflight_lock:
+            fut = self._inflight.get(key)
+            leader = fut is None
+            if leader:
+                fut = self._inflight[key] = Future()
+        if not leader:
+            self.coalesced += 1
+            with gate() if gate else nullcontext():
+                try:
+                    return fut.result(timeout=wait), True
+                except FutureTimeout:
+                    if fut.done():  # 호출 자체가 TimeoutError 로 끝난 경우
+                        raise
+                    raise CoalescedWaitTimeout(key)
+
+        self.misses += 1
+        try:
+            with gate() if gate else nullcontext():
+                response = call()
+            if cacheable is None or cacheable(response):
+                self.put(key, model, response, ttl)
+            fut.set_result(response)
+            return response, False
+        except BaseException as e:
+            fut.set_exception(e)
+            raise
+        finally:
+            with self._inflight_lock:
+                self._inflight.pop(key, None)
+
+    def stats(self) -> dict:
+        with self._lock:
+            entries, size = self._db().execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM llm_cache"
+            ).fetchone()
+        return {
+            "entries": entries,
+            "bytes": size,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+        }
+
+
+# ── GPT 가 만든 양식 중 검증된 것: 고정 템플릿으로 승격 ────────────────────────
+class PromotedTemplates(SQLiteBacked):
+    SCHEMA = _SCHEMA
+
+    def get(self, key: str) -> Optional[List[tuple]]:
+        if not key:
+            return None
+        with self._lock:
+            row = self._db().execute(
+                "SELECT rows FROM promoted_templates WHERE key = ?", (key,)
+            ).fetchone()
+        return [tuple(r) for r in json.loads(row[0])] if row else None
+
+    def promote(self, key: str, name: str, data) -> bool:
+        """OUTPUT_COLUMNS 를 모두 가진(값은 CELL_TYPES) 행 목록일 때만 승격"""
+        if not key or not isinstance(data, list) or not data:
+            return False
+        if not all(isinstance(d, dict)
+                   and all(c in d and isinstance(d[c], CELL_TYPES) for c in OUTPUT_COLUMNS)
+                   for d in data):
+            return False
+        rows = [[d[c] for c in OUTPUT_COLUMNS] for d in data]
+        with self._lock:
+            db = self._db()
+            db.execute(
+                "INSERT OR IGNORE INTO promoted_templates (key, name, rows, created_at) "
+                "VALUES (?, ?, ?, ?)",
+                (key, name, json.dumps(rows, ensure_ascii=False), time.time())
+            )
+            db.commit()
+        logger.info(f"Promoted generated template: {name}")
+        return True
+
+
+_db_path = os.getenv("LLM_CACHE_PATH", LLM_CACHE_PATH)
+llm_cache = LLMCache(
+    _db_path,
+    ttl=float(os.getenv("LLM_CACHE_TTL", str(7 * 86400))),
+    max_bytes=int(os.getenv("LLM_CACHE_MAX_BYTES", str(16 * 1024 * 1024))),
+)
+promoted_templates = PromotedTemplates(_db_path)
+
+
+def chat_completion(model: str, messages: List[dict], ttl: Optional[float] = None,
+                    cacheable: Optional[Callable[[str], bool]] = None,
+                    gate: Optional[Callable[[], ContextManager]] = None, **params) -> Optional[str]:
+    """캐시를 거친 openai.chat.completions.create → 응답 본문
+    (cacheable: 저장할 응답 판정, gate: 호출하거나 같은 호출을 기다릴 때만 잡는 자리 — 캐시 적중은 잡지 않음)"""
+    key = cache_key(model, messages, params)
+
+    def call() -> str:
+        with openai_calls.slot(), span("openai"), upstream_call("openai"):
+            resp = openai.chat.completions.create(
+                model=model, messages=messages, timeout=OPENAI_TIMEOUT, **params
+            )
+        return resp.choices[0].message.content
+
+    try:
+        # 같은 질문을 기다리는 요청도 gate 자리를 잡고, 호출 하나가 끝날 시간까지만 기다린다
+        content, hit = llm_cache.get_or_call(key, model, call, ttl, cacheable, gate,
+                                             wait=openai_calls.wait + OPENAI_TIMEOUT)
+    except CoalescedWaitTimeout:
+        raise Overloaded(openai_calls.name, openai_calls.retry_after)
+    CACHE_REQUESTS.inc(cache="llm", result="hit" if hit else "miss")
+    return content
@@ -0,0 +1,205 @@
+# metrics.py
+# 핫 패스 계측: 단계별 타이밍 span → 엔드포인트/단계별 히스토그램 + 카운터,
+# /metrics 에서 Prometheus 텍스트 형식으로 노출한다.
+# 요청 헤더 X-Profile: 1 을 주면 해당 요청의 단계별 시간을 응답 헤더로 돌려준다.
+# (값은 워커 프로세스별로 집계된다)
+
+import json
+import time
+import threading
+import contextvars
+from contextlib import contextmanager
+from typing import Dict, List, Sequence, Tuple
+
+from flask import Flask, Response, g, request
+
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+PROFILE_HEADER = "X-Profile"
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Sequence[str], values: Tuple, extra: str = "") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+# ── 메트릭 타입 ───────────────────────────────────────────────────────────────
+class Counter:
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, n: float = 1, **labels) -> None:
+        key = tuple(labels.get(l, "") for l in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + n
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{_labels(self.labelnames, k)} {v:g}" for k, v in items]
+
+
+class Histogram:
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        self._values: Dict[Tuple, list] = {}  # key → [버킷별 개수..., 합계, 개수]
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels) -> None:
+        key = tuple(labels.get(l, "") for l in self.labelnames)
+        with self._lock:
+            v = self._values.get(key)
+            if v is None:
+                v = self._values[key] = [0] * len(self.buckets) + [0.0, 0]
+            for i, b in enumerate(self.buckets):
+                if value <= b:
+                    v[i] += 1
+                    break
+            v[-2] += value
+            v[-1] += 1
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = sorted((k, list(v)) for k, v in self._values.items())
+        out = []
+        for key, v in items:
+            cum = 0
+            for i, b in enumerate(self.buckets):
+                cum += v[i]
+                le = _labels(self.labelnames, key, 'le="%g"' % b)
+                out.append(f"{self.name}_bucket{le} {cum}")
+            le = _labels(self.labelnames, key, 'le="+Inf"')
+            out.append(f"{self.name}_bucket{le} {v[-1]}")
+            out.append(f"{self.name}_sum{_labels(self.labelnames, key)} {v[-2]:.6f}")
+            out.append(f"{self.name}_count{_labels(self.labelnames, key)} {v[-1]}")
+        return out
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: list = []
+
+    def counter(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Counter:
+        m = Counter(name, help, labelnames)
+        self._metrics.append(m)
+        return m
+
+    def histogram(self, name: str, help: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        m = Histogram(name, help, labelnames, buckets)
+        self._metrics.append(m)
+        return m
+
+    def render(self) -> str:
+        lines = []
+        for m in self._metrics:
+            lines.append(f"# HELP {m.name} {m.help}")
+            lines.append(f"# TYPE {m.name} {m.kind}")
+            lines.extend(m.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+REQUEST_SECONDS = registry.histogram(
+    "http_request_duration_seconds", "요청 처리 시간", ["endpoint", "status"])
+STAGE_SECONDS = registry.histogram(
+    "stage_duration_seconds", "엔드포인트별 처리 단계 시간", ["endpoint", "stage"])
+RESOLVER_STEPS = registry.counter(
+    "resolver_step_total", "키워드 resolver 매칭 단계별 횟수", ["step"])
+CACHE_REQUESTS = registry.counter(
+    "cache_requests_total", "캐시 조회 결과", ["cache", "result"])
+UPSTREAM_REQUESTS = registry.histogram(
+    "upstream_request_duration_seconds", "외부 호출 시간 (소스/키워드별)", ["upstream", "keyword"])
+UPSTREAM_ERRORS = registry.counter(
+    "upstream_errors_total", "외부 호출 오류", ["upstream"])
+BULKHEAD_REJECTIONS = registry.counter(
+    "bulkhead_rejections_total", "동시 실행 상한 초과로 거절한 수", ["bulkhead"])
+
+
+# ── 타이밍 span ───────────────────────────────────────────────────────────────
+# 현재 요청 정보: {"endpoint": ..., "profile": [(단계, 초), ...] 또는 None}
+_current: contextvars.ContextVar = contextvars.ContextVar("metrics_request", default=None)
+
+
+@contextmanager
+def span(stage: str):
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        dt = time.perf_counter() - t0
+        ctx = _current.get()
+        STAGE_SECONDS.observe(dt, endpoint=ctx["endpoint"] if ctx else "background", stage=stage)
+        if ctx and ctx["profile"] is not None:
+            ctx["profile"].append((stage, dt))
+
+
+@contextmanager
+def upstream_call(upstream: str, keyword: str = ""):
+    """외부 호출 시간/오류 기록 (예외는 그대로 전파)"""
+    t0 = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        UPSTREAM_ERRORS.inc(upstream=upstream)
+        raise
+    finally:
+        UPSTREAM_REQUESTS.observe(time.perf_counter() - t0, upstream=upstream, keyword=keyword)
+
+
+# ── Flask 연동 ────────────────────────────────────────────────────────────────
+def init_metrics(app: Flask) -> None:
+    @app.before_request
+    def _metrics_start():
+        # 라벨 수가 늘어나지 않도록 실제 경로 대신 라우트 규칙을 쓴다
+        endpoint = request.url_rule.rule if request.url_rule else "unmatched"
+        profile = [] if request.headers.get(PROFILE_HEADER) == "1" else None
+        g.metrics_token = _current.set({"endpoint": endpoint, "profile": profile})
+        g.metrics_start = time.perf_counter()
+
+    @app.after_request
+    def _metrics_record(response):
+        start = g.pop("metrics_start", None)
+        if start is None or request.path == "/metrics":
+            return response
+        total = time.perf_counter() - start
+        ctx = _current.get()
+        REQUEST_SECONDS.observe(total, endpoint=ctx["endpoint"], status=response.status_code)
+        profile = ctx["profile"]
+        if profile is not None:
+            parts = [f"{stage};dur={dt * 1000:.3f}" for stage, dt in profile]
+            parts.append(f"total;dur={total * 1000:.3f}")
+            response.headers["Server-Timing"] = ", ".join(parts)
+            response.headers["X-Stage-Breakdown"] = json.dumps(
+                {"total_ms": round(total * 1000, 3),
+                 "stages": [{"stage": s, "ms": round(dt * 1000, 3)} for s, dt in profile]},
+                ensure_ascii=True
+            )
+        return response
+
+    @app.teardown_request
+    def _metrics_reset(exc):
+        token = g.pop("metrics_token", None)
+        if token is not None:
+            _current.reset(token)
+
+    @app.route("/metrics", methods=["GET"])
+    def metrics():
+        return Response(registry.render(), mimetype="text/plain; version=0.0.4")
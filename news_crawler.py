@@ -0,0 +1,210 @@
+# news_crawler.py
+# 네이버 뉴스 API + 안전신문 검색을 스레드 풀에서 동시에 수집하는 크롤러.
+# keep-alive 세션을 공유하고, 전체 마감 시간(deadline)이 지나면 끝난 것만 모아
+# 부분 결과를 돌려준다. 결과는 news_scheduler 가 news_store 에 적재한다.
+# 기사 본문은 URL 별로 캐시해 두고 ETag/Last-Modified 조건부 요청으로만 다시 확인한다.
+
+import os
+import re
+import html
+import time
+import importlib.util
+import logging
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Dict, List, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+from bs4 import BeautifulSoup, SoupStrainer
+
+from metrics import CACHE_REQUESTS, UPSTREAM_ERRORS, upstream_call
+from capacity import NAVER_TIMEOUT, SAFETYNEWS_TIMEOUT, naver_calls, safetynews_calls
+from news_store import NewsStore, news_store
+
+logger = logging.getLogger(__name__)
+
+NEWS_KEYWORDS = ["건설 사고","추락 사고","끼임 사고","질식 사고","폭발 사고","산업재해","산업안전"]
+NAVER_NEWS_URL = "https://openapi.naver.com/v1/search/news.json"
+SAFETYNEWS_BASE = "https://www.safetynews.co.kr"
+USER_AGENT = {"User-Agent": "Mozilla/5.0"}
+ARTICLE_RECHECK_SECONDS = float(os.getenv("ARTICLE_RECHECK_SECONDS", "3600"))
+
+# 필요한 노드만 트리로 만든다
+ARTICLE_STRAINER = SoupStrainer(id="article-view-content-div")
+# class 속성이 통째로("article-list-content text-left") 넘어오는 버전도 있어 직접 나눠 본다
+SEARCH_STRAINER = SoupStrainer(
+    class_=lambda c: bool(c) and "article-list-content" in (c.split() if isinstance(c, str) else c)
+)
+_TAG_RE = re.compile(r"<[^>]*>")
+
+
+def html_parser_backend(name: str = "auto") -> str:
+    """BeautifulSoup 파서: auto 는 lxml 이 설치돼 있으면 lxml, 아니면 html.parser"""
+    if name in ("auto", "lxml"):
+        if importlib.util.find_spec("lxml") is not None:
+            return "lxml"
+        if name == "lxml":
+            logger.warning("lxml 이 없어 html.parser 를 사용합니다.")
+    return "html.parser"
+
+
+def strip_tags(text: str) -> str:
+    """네이버 API 제목/요약용: <b> 같은 인라인 태그 제거 + 엔티티 복원 (트리 생성 없음)"""
+    return html.unescape(_TAG_RE.sub("", text))
+
+
+class NewsCrawler:
+    def __init__(self, naver_client_id: Optional[str], naver_client_secret: Optional[str],
+                 max_workers: int = 8, naver_timeout: float = NAVER_TIMEOUT,
+                 safetynews_timeout: float = SAFETYNEWS_TIMEOUT, deadline: float = 8,
+                 body_cache: Optional[NewsStore] = None,
+                 parser: str = "html.parser", body_recheck: float = ARTICLE_RECHECK_SECONDS):
+        self.naver_headers = {
+            "X-Naver-Client-Id": naver_client_id,
+            "X-Naver-Client-Secret": naver_client_secret
+        }
+        self.naver_timeout = naver_timeout
+        self.safetynews_timeout = safetynews_timeout
+        self.deadline = deadline
+        self.body_cache = body_cache
+        self.parser = parser
+        self.body_recheck = body_recheck
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=max_workers)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="news")
+
+    # ── 개별 요청 (작업 스레드) ────────────────────────────────────────────────
+    def fetch_safetynews_article_content(self, url: str) -> str:
+        cached = self.body_cache.get_article_body(url) if self.body_cache else None
+        if cached and time.time() - cached["checked_at"] < self.body_recheck:
+            CACHE_REQUESTS.inc(cache="article_body", result="hit")
+            return cached["body"]
+
+        headers = dict(USER_AGENT)
+        if cached:
+            if cached["etag"]:
+                headers["If-None-Match"] = cached["etag"]
+            if cached["last_modified"]:
+                headers["If-Modified-Since"] = cached["last_modified"]
+        try:
+            with safetynews_calls.slot(), upstream_call("safetynews_article"):
+                r = self.session.get(url, headers=headers, timeout=self.safetynews_timeout)
+            if r.status_code == 304 and cached:
+                CACHE_REQUESTS.inc(cache="article_body", result="revalidated")
+                self.body_cache.touch_article_body(url)
+                return cached["body"]
+            if r.status_code != 200:
+                return cached["body"] if cached else ""
+            CACHE_REQUESTS.inc(cache="article_body", result="miss")
+            soup = BeautifulSoup(r.text, self.parser, parse_only=ARTICLE_STRAINER)
+            node = soup.select_one("div#article-view-content-div")
+            body = node.get_text("\n").strip() if node else ""
+            if self.body_cache and body:
+                self.body_cache.put_article_body(
+                    url, body, r.headers.get("ETag"), r.headers.get("Last-Modified")
+                )
+            return body
+        except Exception:
+            return cached["body"] if cached else ""
+
+    def _naver_keyword(self, kw: str) -> List[dict]:
+        with naver_calls.slot(), upstream_call("naver", kw):
+            r = self.session.get(NAVER_NEWS_URL, headers=self.naver_headers,
+                                 params={"query": kw, "display": 2, "sort": "date"},
+                                 timeout=self.naver_timeout)
+        if r.status_code != 200:
+            UPSTREAM_ERRORS.inc(upstream="naver")
+            return []
+        out = []
+        for item in r.json().get("items", []):
+            title = strip_tags(item["title"])
+            desc  = strip_tags(item["description"])
+            out.append({
+                "출처": item.get("originallink", "네이버"),
+                "제목": title,
+                "링크": item.get("link", ""),
+                "날짜": item.get("pubDate", ""),
+                "본문": desc,
+                "분류": kw,
+                "provider": "naver"
+            })
+        return out
+
+    def _safetynews_keyword(self, kw: str) -> List[dict]:
+        """검색 결과 목록만 (본문은 별도 작업으로 가져온다)"""
+        with safetynews_calls.slot(), upstream_call("safetynews", kw):
+            r = self.session.get(f"{SAFETYNEWS_BASE}/search/news?searchword={kw}",
+                                 headers=USER_AGENT, timeout=self.safetynews_timeout)
+        if r.status_code != 200:
+            UPSTREAM_ERRORS.inc(upstream="safetynews")
+            return []
+        soup = BeautifulSoup(r.text, self.parser, parse_only=SEARCH_STRAINER)
+        out = []
+        for item in soup.select(".article-list-content")[:2]:
+            t = item.select_one(".list-titles")
+            href = SAFETYNEWS_BASE + t["href"] if t and t.get("href") else ""
+            d    = item.select_one(".list-dated")
+            out.append({
+                "출처": "안전신문",
+                "제목": t.get_text(strip=True) if t else "",
+                "링크": href,
+                "날짜": d.get_text(strip=True) if d else "",
+                "본문": "",
+                "분류": kw,
+                "provider": "safetynews"
+            })
+        return out
+
+    # ── 동시 수집 ──────────────────────────────────────────────────────────────
+    def crawl(self, deadline: Optional[float] = None) -> Tuple[List[dict], bool]:
+        """(기사 목록, 부분 결과 여부) — 네이버 → 안전신문, 키워드 순서 유지"""
+        end = time.monotonic() + (self.deadline if deadline is None else deadline)
+        slots: Dict[Tuple[int, int], List[dict]] = {}
+        pending = {}
+        for i, kw in enumerate(NEWS_KEYWORDS):
+            pending[self.pool.submit(self._naver_keyword, kw)] = ("naver", (0, i))
+            pending[self.pool.submit(self._safetynews_keyword, kw)] = ("safetynews", (1, i))
+
+        while pending:
+            remaining = end - time.monotonic()
+            if remaining <= 0:
+                break
+            done, _ = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+            for fut in done:
+                kind, ref = pending.pop(fut)
+                try:
+                    result = fut.result()
+                except Exception as e:
+                    logger.warning(f"News fetch failed ({kind} {ref}): {e}")
+                    continue
+                if kind == "article":
+                    ref["본문"] = result[:1000]
+                    continue
+                slots[ref] = result
+                if kind == "safetynews":
+                    # 안전신문 본문은 검색 결과가 나오는 대로 바로 요청
+                    for item in result:
+                        if item["링크"]:
+                            fut2 = self.pool.submit(self.fetch_safetynews_article_content, item["링크"])
+                            pending[fut2] = ("article", item)
+
+        partial = bool(pending)
+        for fut in pending:
+            fut.cancel()
+        if partial:
+            logger.warning(f"News crawl deadline exceeded: {len(pending)} fetches dropped")
+        news = [n for key in sorted(slots) for n in slots[key]]
+        return news, partial
+
+
+news_crawler = NewsCrawler(
+    os.getenv("NAVER_CLIENT_ID"),
+    os.getenv("NAVER_CLIENT_SECRET"),
+    max_workers=int(os.getenv("NEWS_CRAWL_WORKERS", "8")),
+    deadline=float(os.getenv("NEWS_CRAWL_DEADLINE", "8")),
+    body_cache=news_store,
+    parser=html_parser_backend(os.getenv("NEWS_HTML_PARSER", "auto")),
+)
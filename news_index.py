@@ -0,0 +1,146 @@
+# news_index.py
+# 뉴스 조회용 시간 정렬 색인: 저장소의 기사를 한 번 읽어 (게시시각, 수집시각, id)
+# 오름차순 키 배열로 들고 있고, 기간·커서는 bisect 로, 수집원/분류 필터는 값별
+# 부분 배열로 답한다. 저장소가 바뀌면(data_version) 다음 조회 때 다시 읽는다.
+
+import json
+import time
+import base64
+import threading
+from bisect import bisect_left
+from typing import Dict, List, Optional, Tuple
+
+from news_store import NewsStore, news_store
+
+NO_DATE = float("-inf")  # 날짜를 모르는 기사: 항상 가장 오래된 쪽
+
+Key = Tuple[float, float, str]
+
+
+class CursorError(ValueError):
+    pass
+
+
+def encode_cursor(key: Key) -> str:
+    raw = json.dumps([None if key[0] == NO_DATE else key[0], key[1], key[2]])
+    return base64.urlsafe_b64encode(raw.encode("ascii")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Key:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        ts, fetched, aid = json.loads(raw)
+        return (NO_DATE if ts is None else float(ts), float(fetched), str(aid))
+    except (ValueError, TypeError):
+        raise CursorError("잘못된 cursor 값입니다.")
+
+
+class _Facet:
+    """키 오름차순 배열 + 같은 순서의 기사"""
+
+    def __init__(self):
+        self.keys: List[Key] = []
+        self.items: List[dict] = []
+
+
+class NewsIndex:
+    def __init__(self, store: NewsStore, check_interval: float = 1.0):
+        self.store = store
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._version = None
+        self._checked_at = 0.0
+        self._all = _Facet()
+        self._by_provider: Dict[str, _Facet] = {}
+        self._by_category: Dict[str, _Facet] = {}
+
+    def _refresh(self) -> None:
+        if time.monotonic() - self._checked_at < self.check_interval:
+            return
+        with self._lock:
+            if time.monotonic() - self._checked_at < self.check_interval:
+                return
+            version = self.store.data_version()
+            if version != self._version:
+                self._build(self.store.all_articles())
+                self._version = version
+            self._checked_at = time.monotonic()
+
+    def _build(self, rows) -> None:
+        entries = []
+        for r in rows:
+            ts = r["published_at"]
+            key = (NO_DATE if ts is None else ts, r["fetched_at"], r["id"])
+            entries.append((key, {
+                "출처": r["source"],
+                "제목": r["title"],
+                "링크": r["link"],
+                "날짜": r["date_text"],
+                "본문": r["body"],
+                "분류": r["category"],
+                "provider": r["provider"],
+                "published_at": ts,
+            }))
+        entries.sort(key=lambda e: e[0])
+
+        all_, by_provider, by_category = _Facet(), {}, {}
+        for key, item in entries:
+            for facet in (all_, by_provider.setdefault(item["provider"], _Facet()),
+                          by_category.setdefault(item["분류"], _Facet())):
+                facet.keys.append(key)
+                facet.items.append(item)
+        # 참조 교체만: 조회 중인 스레드는 이전 색인을 끝까지 본다
+        self._all, self._by_provider, self._by_category = all_, by_provider, by_category
+
+    def query(self, since: Optional[float] = None, until: Optional[float] = None,
+              provider: Optional[str] = None, category: Optional[str] = None,
+              limit: Optional[int] = None, cursor: Optional[str] = None) -> Tuple[List[dict], Optional[str]]:
+        """최신순 기사 목록과 다음 페이지 cursor — since 이상, until 미만 (epoch 초)"""
+        self._refresh()
+        all_, by_provider, by_category = self._all, self._by_provider, self._by_category
+
+        # 필터가 있으면 더 작은 부분 배열에서 시작하고 나머지 조건만 확인
+        facets = []
+        if provider:
+            facets.append((by_provider.get(provider) or _Facet(), "provider", provider))
+        if category:
+            facets.append((by_category.get(category) or _Facet(), "분류", category))
+        facets.sort(key=lambda f: len(f[0].keys))
+        base = facets[0][0] if facets else all_
+        extra = facets[1:]
+
+        lo = 0 if since is None else bisect_left(base.keys, (since,))
+        hi = len(base.keys) if until is None else bisect_left(base.keys, (until,))
+        if cursor:
+            hi = min(hi, bisect_left(base.keys, decode_cursor(cursor)))
+
+        if not extra:
+            start = lo if limit is None else max(lo, hi - limit)
+            out = base.items[start:hi][::-1]
+            next_cursor = encode_cursor(base.keys[start]) if start > lo else None
+            return out, next_cursor
+
+        # 다음 페이지 유무를 알기 위해 한 건 더 찾아 본다
+        picked: List[int] = []
+        i = hi - 1
+        while i >= lo and (limit is None or len(picked) <= limit):
+            item = base.items[i]
+            if all(item[field] == value for _, field, value in extra):
+                picked.append(i)
+            i -= 1
+        more = limit is not None and len(picked) > limit
+        if more:
+            picked = picked[:limit]
+        next_cursor = encode_cursor(base.keys[picked[-1]]) if more else None
+        return [base.items[j] for j in picked], next_cursor
+
+    def providers(self) -> List[str]:
+        self._refresh()
+        return sorted(p for p in self._by_provider if p)
+
+    def categories(self) -> List[str]:
+        self._refresh()
+        return sorted(c for c in self._by_category if c)
+
+
+news_index = NewsIndex(news_store)
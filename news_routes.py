@@ -0,0 +1,101 @@
+# news_routes.py
+# 뉴스 조회 / GPT 렌더링 라우트 (백그라운드 수집된 news_store 를 news_index 로 읽기만 한다)
+
+from flask import Blueprint, jsonify, request
+import os
+import math
+import time
+
+from llm_cache import chat_completion
+from news_index import CursorError, news_index
+from news_store import format_news_date, parse_news_date
+from news_scheduler import ensure_news_loaded
+from capacity import upstream_requests
+
+bp = Blueprint("news", __name__)
+
+# ── 뉴스 엔드포인트 (백그라운드 수집 → 저장소 조회) ──────────────────────────────
+NEWS_DAYS = 3
+NEWS_DEFAULT_LIMIT = 50
+NEWS_MAX_LIMIT = 500
+
+def _time_arg(name: str):
+    """epoch 초 또는 날짜 문자열 (시간대 없는 값은 KST)"""
+    v = request.args.get(name, "")
+    if not v:
+        return None
+    try:
+        ts = float(v)
+    except ValueError:
+        ts = parse_news_date(v)
+    # nan/inf 는 float() 를 통과하지만 비교가 뜻이 없다
+    if ts is None or not math.isfinite(ts):
+        raise ValueError(name)
+    return ts
+
+@bp.route("/news", methods=["GET"])
+def query_news():
+    """?since=&until=&source=naver|safetynews&category=키워드&limit=50&cursor= (최신순)"""
+    try:
+        since = _time_arg("since")
+        until = _time_arg("until")
+    except ValueError as e:
+        return jsonify(error=f"{e} 는 epoch 초 또는 날짜(예: 2025-01-31T09:00) 여야 합니다."), 400
+    try:
+        limit = int(request.args.get("limit") or NEWS_DEFAULT_LIMIT)
+    except ValueError:
+        limit = 0
+    if limit < 1:
+        return jsonify(error="limit 는 1 이상의 정수여야 합니다."), 400
+
+    ensure_news_loaded()
+    try:
+        items, next_cursor = news_index.query(
+            since=since, until=until,
+            provider=request.args.get("source") or None,
+            category=request.args.get("category") or None,
+            limit=min(limit, NEWS_MAX_LIMIT), cursor=request.args.get("cursor") or None,
+        )
+    except CursorError as e:
+        return jsonify(error=str(e)), 400
+    return jsonify(items=items, next_cursor=next_cursor)
+
+@bp.route("/daily_news", methods=["GET"])
+def get_daily_news():
+    ensure_news_loaded()
+    news, _ = news_index.query(limit=int(os.getenv("NEWS_DAILY_LIMIT", "50")))
+    if not news:
+        return jsonify(error="가져올 뉴스가 없습니다."), 200
+    return jsonify(news)
+
+@bp.route("/render_news", methods=["GET"])
+def render_news():
+    ensure_news_loaded()
+    recent, _ = news_index.query(since=time.time() - NEWS_DAYS * 86400, limit=3)
+    items = [{
+        "출처": n["출처"],
+        "제목": n["제목"],
+        "링크": n["링크"],
+        "날짜": format_news_date(n["published_at"]),
+        "본문": n["본문"]
+    } for n in recent]
+    if not items:
+        return jsonify(error="가져올 뉴스가 없습니다."), 200
+
+    template = (
+        "📌 산업 안전 및 보건 최신 뉴스\n"
+        "📰 “{title}” ({date}, {출처})\n\n"
+        "{본문}\n"
+        "🔎 더 보려면 “뉴스 더 보여줘”를 입력하세요."
+    )
+    system_msg = {
+        "role": "system",
+        "content": f"다음 JSON 형식의 뉴스 목록을 아래 템플릿에 맞춰 출력하세요.\n템플릿:\n{template}"
+    }
+    user_msg = {"role": "user", "content": str(items)}
+    # LLM 캐시 적중은 외부 호출 자리를 잡지 않는다
+    content = chat_completion(
+        model="gpt-4o-mini", messages=[system_msg, user_msg],
+        max_tokens=800, temperature=0.7, gate=upstream_requests.slot
+    )
+    return jsonify(formatted_news=content)
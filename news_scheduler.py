@@ -0,0 +1,61 @@
+# news_scheduler.py
+# 네이버/안전신문 기사를 백그라운드에서 주기적으로 수집해 news_store 에 적재
+
+import os
+import time
+import logging
+import threading
+from datetime import datetime
+from typing import Optional
+
+from apscheduler.schedulers.background import BackgroundScheduler
+
+from news_crawler import news_crawler
+from news_store import news_store
+from capacity import upstream_requests
+from metrics import span
+
+logger = logging.getLogger(__name__)
+
+NEWS_REFRESH_MINUTES = float(os.getenv("NEWS_REFRESH_MINUTES", "10"))
+
+_refresh_lock = threading.Lock()
+_scheduler: Optional[BackgroundScheduler] = None
+last_refresh = {"at": None, "added": 0, "fetched": 0, "partial": False}
+
+
+def _refresh_locked() -> int:
+    with span("news_crawl"):
+        news, partial = news_crawler.crawl()
+    added = news_store.ingest(news)
+    last_refresh.update(at=time.time(), added=added, fetched=len(news), partial=partial)
+    logger.info(f"News refresh: {len(news)} fetched, {added} new{' (partial)' if partial else ''}")
+    return added
+
+
+def refresh_news() -> int:
+    """한 번 수집해 저장하고 새로 추가된 기사 수를 돌려준다"""
+    with _refresh_lock:
+        return _refresh_locked()
+
+
+def ensure_news_loaded() -> None:
+    """저장소가 비어 있고 아직 수집 전이면 (콜드 스타트) 한 번 동기 수집"""
+    if last_refresh["at"] is not None or news_store.count() > 0:
+        return
+    with upstream_requests.slot(), _refresh_lock:
+        if last_refresh["at"] is None:
+            _refresh_locked()
+
+
+def start_news_scheduler(interval_minutes: float = NEWS_REFRESH_MINUTES) -> BackgroundScheduler:
+    global _scheduler
+    if _scheduler is None:
+        _scheduler = BackgroundScheduler(daemon=True)
+        _scheduler.add_job(
+            refresh_news, "interval", minutes=interval_minutes,
+            id="news_refresh", next_run_time=datetime.now(), max_instances=1, coalesce=True
+        )
+        _scheduler.start()
+        logger.info(f"News scheduler started (every {interval_minutes:g} min)")
+    return _scheduler
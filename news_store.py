@@ -0,0 +1,205 @@
+# news_store.py
+# 수집한 뉴스 기사를 저장하는 로컬 SQLite 저장소.
+# 정규화한 링크/제목 해시로 중복을 막고, 날짜는 수집 시 한 번만 파싱해
+# UTC epoch 로 저장한다 (published_at 인덱스로 기간 조회).
+
+import os
+import re
+import time
+import hashlib
+import logging
+import sqlite3
+from datetime import datetime, timedelta, timezone
+from typing import Iterable, List, Optional
+from urllib.parse import urlsplit
+
+from dateutil import parser
+
+from sqlite_store import SQLiteBacked
+from template_catalog import DATA_DIR
+
+logger = logging.getLogger(__name__)
+
+NEWS_DB_PATH = os.path.join(DATA_DIR, "news.db")
+KST = timezone(timedelta(hours=9))
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS articles (
+    id           TEXT PRIMARY KEY,
+    title_hash   TEXT UNIQUE,
+    source       TEXT NOT NULL,
+    title        TEXT NOT NULL,
+    link         TEXT NOT NULL,
+    date_text    TEXT NOT NULL,
+    published_at REAL,
+    body         TEXT NOT NULL,
+    fetched_at   REAL NOT NULL,
+    provider     TEXT NOT NULL DEFAULT '',
+    category     TEXT NOT NULL DEFAULT ''
+);
+CREATE INDEX IF NOT EXISTS idx_articles_published ON articles(published_at);
+CREATE TABLE IF NOT EXISTS meta (
+    key   TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS article_bodies (
+    url           TEXT PRIMARY KEY,
+    body          TEXT NOT NULL,
+    etag          TEXT,
+    last_modified TEXT,
+    checked_at    REAL NOT NULL
+);
+"""
+ARTICLE_BODY_RETENTION = 30 * 86400
+
+# ── 정규화 / 해시 ─────────────────────────────────────────────────────────────
+def normalize_link(link: str) -> str:
+    """스킴·www·끝 슬래시 차이를 무시한 링크"""
+    parts = urlsplit(link.strip())
+    host = parts.netloc.lower()
+    if host.startswith("www."):
+        host = host[4:]
+    norm = host + parts.path.rstrip("/")
+    if parts.query:
+        norm += "?" + parts.query
+    return norm
+
+
+def normalize_title(title: str) -> str:
+    return re.sub(r"[^0-9a-z가-힣]", "", title.lower())
+
+
+def _sha1(text: str) -> str:
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+def parse_news_date(text: str) -> Optional[float]:
+    """기사 날짜 문자열 → UTC epoch (시간대 없는 값은 KST 로 간주)"""
+    if not text:
+        return None
+    try:
+        dt = parser.parse(text)
+    except (ValueError, OverflowError):
+        return None
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=KST)
+    return dt.timestamp()
+
+
+# ── 저장소 ────────────────────────────────────────────────────────────────────
+class NewsStore(SQLiteBacked):
+    SCHEMA = _SCHEMA
+    ROW_FACTORY = sqlite3.Row
+
+    def __init__(self, path: str = NEWS_DB_PATH):
+        super().__init__(path)
+        with self._lock:
+            self._db()
+
+    def _migrate(self, conn: sqlite3.Connection) -> None:
+        # 이전 스키마의 DB: 수집원/키워드 분류 컬럼 추가
+        cols = {r["name"] for r in conn.execute("PRAGMA table_info(articles)")}
+        for col in ("provider", "category"):
+            if col not in cols:
+                conn.execute(f"ALTER TABLE articles ADD COLUMN {col} TEXT NOT NULL DEFAULT ''")
+
+    def ingest(self, items: Iterable[dict]) -> int:
+        """새 기사를 저장하고 추가된 개수를 돌려준다.
+        마감 시간에 걸려 본문 없이 저장된 기사는 이후 수집에서 본문이 오면 채운다."""
+        now = time.time()
+        rows = []
+        for n in items:
+            link, title = n.get("링크", ""), n.get("제목", "")
+            if not link and not title:
+                continue
+            norm_title = normalize_title(title)
+            rows.append((
+                _sha1(normalize_link(link) if link else "title:" + norm_title),
+                _sha1(norm_title) if norm_title else None,
+                n.get("출처", ""),
+                title,
+                link,
+                n.get("날짜", ""),
+                parse_news_date(n.get("날짜", "")),
+                n.get("본문", ""),
+                now,
+                n.get("provider", ""),
+                n.get("분류", ""),
+            ))
+        with self._lock:
+            db = self._db()
+            before = db.total_changes
+            count_before = db.execute("SELECT COUNT(*) FROM articles").fetchone()[0]
+            db.executemany(
+                "INSERT INTO articles "
+                "(id, title_hash, source, title, link, date_text, published_at, body, fetched_at, "
+                "provider, category) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(id) DO UPDATE SET body = excluded.body "
+                "WHERE articles.body = '' AND excluded.body != '' "
+                "ON CONFLICT DO NOTHING",
+                rows
+            )
+            added = db.execute("SELECT COUNT(*) FROM articles").fetchone()[0] - count_before
+            if db.total_changes != before:
+                # articles 가 바뀐 경우에만 (본문 캐시 쓰기로는 올리지 않는다)
+                db.execute(
+                    "INSERT INTO meta (key, value) VALUES ('articles_version', 1) "
+                    "ON CONFLICT(key) DO UPDATE SET value = value + 1"
+                )
+            db.commit()
+            return added
+
+    def data_version(self) -> int:
+        """articles 변경 감지용 카운터 (모든 프로세스의 추가·본문 보충에서 올라감)"""
+        with self._lock:
+            row = self._db().execute(
+                "SELECT value FROM meta WHERE key = 'articles_version'"
+            ).fetchone()
+        return row[0] if row else 0
+
+    def all_articles(self) -> List[sqlite3.Row]:
+        with self._lock:
+            return self._db().execute(
+                "SELECT id, source, title, link, date_text, published_at, body, fetched_at, "
+                "provider, category FROM articles"
+            ).fetchall()
+
+    def count(self) -> int:
+        with self._lock:
+            return self._db().execute("SELECT COUNT(*) FROM articles").fetchone()[0]
+
+    # ── 기사 본문 캐시 (URL → 추출한 본문 + 조건부 요청용 ETag/Last-Modified) ──
+    def get_article_body(self, url: str) -> Optional[dict]:
+        with self._lock:
+            r = self._db().execute(
+                "SELECT body, etag, last_modified, checked_at FROM article_bodies WHERE url = ?", (url,)
+            ).fetchone()
+        return dict(r) if r else None
+
+    def put_article_body(self, url: str, body: str, etag: Optional[str],
+                         last_modified: Optional[str]) -> None:
+        now = time.time()
+        with self._lock:
+            db = self._db()
+            db.execute(
+                "INSERT OR REPLACE INTO article_bodies (url, body, etag, last_modified, checked_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (url, body, etag, last_modified, now)
+            )
+            db.execute("DELETE FROM article_bodies WHERE checked_at < ?", (now - ARTICLE_BODY_RETENTION,))
+            db.commit()
+
+    def touch_article_body(self, url: str) -> None:
+        """304 로 확인된 본문: 확인 시각만 갱신"""
+        with self._lock:
+            db = self._db()
+            db.execute("UPDATE article_bodies SET checked_at = ? WHERE url = ?", (time.time(), url))
+            db.commit()
+
+
+def format_news_date(ts: float) -> str:
+    return datetime.fromtimestamp(ts, KST).strftime("%Y.%m.%d")
+
+
+news_store = NewsStore(os.getenv("NEWS_DB_PATH", NEWS_DB_PATH))
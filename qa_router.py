@@ -0,0 +1,105 @@
+# qa_router.py
+# 산안법 질문-응답 고정 템플릿 라우터.
+# 정규화한 질문 문자열 해시맵으로 정확 일치를 먼저 찾고, 없으면 문자 2/3-gram
+# TF-IDF 역색인으로 가장 가까운 질문을 찾아 임계값 이상일 때만 답한다.
+
+import os
+import re
+import csv
+import math
+import logging
+import unicodedata
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+QA_CSV_NAME = "산안법_질문응답_고정템플릿_20개.csv"
+QA_CSV_CANDIDATES = [
+    os.getenv("QA_CSV_PATH", ""),
+    os.path.join("/mnt/data", QA_CSV_NAME),
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), QA_CSV_NAME),
+]
+QA_COLUMNS = ["질문문장", "조문번호", "조문제목", "응답템플릿"]
+QA_MATCH_THRESHOLD = float(os.getenv("QA_MATCH_THRESHOLD", "0.4"))
+NGRAM_SIZES = (2, 3)
+
+
+def normalize_question(text: str) -> str:
+    """공백·문장부호·대소문자 차이를 없앤 질문 키"""
+    return re.sub(r"[^0-9a-z가-힣]", "", unicodedata.normalize("NFKC", text).lower())
+
+
+def char_ngrams(norm: str) -> Counter:
+    grams = Counter()
+    for n in NGRAM_SIZES:
+        if len(norm) < n:
+            if norm and n == NGRAM_SIZES[0]:
+                grams[norm] += 1
+            continue
+        for i in range(len(norm) - n + 1):
+            grams[norm[i:i + n]] += 1
+    return grams
+
+
+class QARouter:
+    def __init__(self, rows: List[dict], threshold: float = QA_MATCH_THRESHOLD):
+        self.rows = rows
+        self.threshold = threshold
+
+        # 1) 정확 일치: 정규화 질문 → 행 번호 (먼저 나온 행 우선)
+        self._exact: Dict[str, int] = {}
+        for i, r in enumerate(rows):
+            self._exact.setdefault(normalize_question(r["질문문장"]), i)
+
+        # 2) TF-IDF 역색인: n-gram → [(행 번호, 정규화된 가중치)]
+        docs = [char_ngrams(normalize_question(r["질문문장"])) for r in rows]
+        df = Counter(g for d in docs for g in d)
+        n_docs = len(docs)
+        self._idf = {g: math.log((1 + n_docs) / (1 + c)) + 1.0 for g, c in df.items()}
+        self._unseen_idf = math.log(1 + n_docs) + 1.0
+        self._postings: Dict[str, List[Tuple[int, float]]] = {}
+        for i, d in enumerate(docs):
+            vec = {g: tf * self._idf[g] for g, tf in d.items()}
+            norm = math.sqrt(sum(w * w for w in vec.values())) or 1.0
+            for g, w in vec.items():
+                self._postings.setdefault(g, []).append((i, w / norm))
+
+    @classmethod
+    def from_csv(cls, path: Optional[str] = None) -> "QARouter":
+        paths = [path] if path else [p for p in QA_CSV_CANDIDATES if p]
+        for p in paths:
+            if os.path.exists(p):
+                with open(p, encoding="utf-8-sig", newline="") as f:
+                    rows = [r for r in csv.DictReader(f) if r.get("질문문장")]
+                logger.info(f"QA templates loaded: {len(rows)} rows ({p})")
+                return cls(rows)
+        logger.warning("QA template CSV not found; every question routes to GPT")
+        return cls([])
+
+    def match(self, question: str) -> Tuple[Optional[dict], float, str]:
+        """(행 또는 None, 점수, 방식: exact/similar/none)"""
+        norm = normalize_question(question)
+        i = self._exact.get(norm)
+        if i is not None:
+            return self.rows[i], 1.0, "exact"
+
+        # 색인에 없는 n-gram 은 가장 희귀한 값(idf 최대)으로 질의 길이에만 반영
+        grams = char_ngrams(norm)
+        q = {g: tf * self._idf[g] for g, tf in grams.items() if g in self._idf}
+        if not q:
+            return None, 0.0, "none"
+        unseen = sum((tf * self._unseen_idf) ** 2 for g, tf in grams.items() if g not in self._idf)
+        q_norm = math.sqrt(sum(w * w for w in q.values()) + unseen)
+        scores: Dict[int, float] = {}
+        for g, w in q.items():
+            for j, dw in self._postings[g]:
+                scores[j] = scores.get(j, 0.0) + w * dw
+        best = max(scores, key=lambda j: (scores[j], -j))
+        score = scores[best] / q_norm
+        if score >= self.threshold:
+            return self.rows[best], score, "similar"
+        return None, score, "none"
+
+
+qa_router = QARouter.from_csv()
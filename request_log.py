@@ -0,0 +1,205 @@
+# request_log.py
+# 요청 분석 로그: 요청 경로에서는 큐에 넣기만 하고, 백그라운드 스레드가 모아서
+# 날짜별 파티션(data/analytics/date=YYYY-MM-DD/)에 append-only CSV 로 기록한다.
+# 같은 스레드가 일별 누적 집계(agg-<pid>.json)도 함께 갱신해 두므로 리포트는
+# 원본 로그 전체를 다시 읽지 않아도 된다.
+
+import os
+import csv
+import glob
+import json
+import time
+import queue
+import atexit
+import logging
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Optional
+
+from flask import Flask, g, has_app_context, request
+
+from template_catalog import DATA_DIR
+
+logger = logging.getLogger(__name__)
+
+ANALYTICS_DIR = os.path.join(DATA_DIR, "analytics")
+LOG_FIELDS = [
+    "timestamp", "endpoint", "status", "keyword", "template", "step",
+    "cache", "gpt_fallback", "latency_ms",
+]
+SKIP_PATHS = {"/health", "/metrics"}
+
+
+def partition_dir(day: str, base: str = ANALYTICS_DIR) -> str:
+    return os.path.join(base, f"date={day}")
+
+
+def _new_aggregate() -> dict:
+    return {
+        "requests": 0,
+        "gpt_fallback": 0,
+        "by_endpoint": {},
+        "by_status": {},
+        "by_template": {},
+        "by_step": {},
+        "by_cache": {},
+    }
+
+
+def _bump(d: dict, key: str, n: int = 1) -> None:
+    d[key] = d.get(key, 0) + n
+
+
+def template_request_counts(days: int = 7, base: str = ANALYTICS_DIR) -> Dict[str, int]:
+    """최근 days 일(UTC, 오늘 포함) 일별 집계의 템플릿별 요청 수 합계"""
+    today = datetime.now(timezone.utc).date()
+    counts: Dict[str, int] = {}
+    for n in range(days):
+        part = partition_dir((today - timedelta(days=n)).isoformat(), base)
+        for path in glob.glob(os.path.join(part, "agg-*.json")):
+            try:
+                with open(path, encoding="utf-8") as f:
+                    by_template = json.load(f).get("by_template", {})
+            except (OSError, ValueError) as e:
+                logger.warning(f"Skipping aggregate {path}: {e}")
+                continue
+            for tpl, c in by_template.items():
+                _bump(counts, tpl, c)
+    return counts
+
+
+# ── 백그라운드 기록기 ─────────────────────────────────────────────────────────
+class RequestLogWriter:
+    def __init__(self, base_dir: str = ANALYTICS_DIR, flush_interval: float = 2.0,
+                 max_queue: int = 10000):
+        self.base_dir = base_dir
+        self.flush_interval = flush_interval
+        self._queue: "queue.Queue[dict]" = queue.Queue(maxsize=max_queue)
+        self._pid = None
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        self._aggregates: Dict[str, dict] = {}
+        self.dropped = 0
+
+    def record(self, entry: dict) -> None:
+        """요청 스레드에서 호출: 큐에 넣기만 한다 (가득 차면 버림)"""
+        self._ensure_thread()
+        try:
+            self._queue.put_nowait(entry)
+        except queue.Full:
+            self.dropped += 1
+
+    def _ensure_thread(self) -> None:
+        # fork 된 워커마다 자기 기록 스레드를 띄운다
+        if self._pid == os.getpid():
+            return
+        with self._start_lock:
+            if self._pid == os.getpid():
+                return
+            self._queue = queue.Queue(maxsize=self._queue.maxsize)
+            self._aggregates = {}
+            self._thread = threading.Thread(target=self._run, name="request-log", daemon=True)
+            self._thread.start()
+            self._pid = os.getpid()
+
+    def _run(self) -> None:
+        while True:
+            time.sleep(self.flush_interval)
+            self.flush()
+
+    def flush(self) -> int:
+        batch = []
+        while True:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        if not batch:
+            return 0
+
+        by_day: Dict[str, list] = {}
+        for e in batch:
+            by_day.setdefault(e["timestamp"][:10], []).append(e)
+        for day, rows in by_day.items():
+            try:
+                self._append(day, rows)
+            except OSError as e:
+                logger.error(f"Request log write failed ({day}): {e}")
+        return len(batch)
+
+    def _append(self, day: str, rows: list) -> None:
+        d = partition_dir(day, self.base_dir)
+        os.makedirs(d, exist_ok=True)
+        pid = os.getpid()
+
+        path = os.path.join(d, f"part-{pid}.csv")
+        new = not os.path.exists(path)
+        with open(path, "a", encoding="utf-8", newline="") as f:
+            w = csv.DictWriter(f, fieldnames=LOG_FIELDS, extrasaction="ignore")
+            if new:
+                w.writeheader()
+            w.writerows(rows)
+
+        agg = self._aggregates.get(day)
+        agg_path = os.path.join(d, f"agg-{pid}.json")
+        if agg is None:
+            agg = _new_aggregate()
+            if os.path.exists(agg_path):
+                with open(agg_path, encoding="utf-8") as f:
+                    agg = json.load(f)
+            self._aggregates = {day: agg}
+        for e in rows:
+            agg["requests"] += 1
+            agg["gpt_fallback"] += int(bool(e.get("gpt_fallback")))
+            ep = agg["by_endpoint"].setdefault(e["endpoint"], {"count": 0, "latency_ms_sum": 0.0, "latency_ms_max": 0.0})
+            ep["count"] += 1
+            ep["latency_ms_sum"] += e["latency_ms"]
+            ep["latency_ms_max"] = max(ep["latency_ms_max"], e["latency_ms"])
+            _bump(agg["by_status"], str(e["status"]))
+            if e.get("template"):
+                _bump(agg["by_template"], e["template"])
+            if e.get("step"):
+                _bump(agg["by_step"], e["step"])
+            if e.get("cache"):
+                _bump(agg["by_cache"], e["cache"])
+        tmp = agg_path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(agg, f, ensure_ascii=False)
+        os.replace(tmp, agg_path)
+
+
+request_log = RequestLogWriter(os.getenv("ANALYTICS_DIR", ANALYTICS_DIR))
+atexit.register(request_log.flush)
+
+
+# ── Flask 연동 ────────────────────────────────────────────────────────────────
+def annotate(**fields) -> None:
+    """엔드포인트에서 현재 요청의 분석 필드(keyword, template, step, cache, gpt_fallback) 기록"""
+    if not has_app_context():
+        return
+    info = g.get("analytics")
+    if info is not None:
+        info.update(fields)
+
+
+def init_request_log(app: Flask) -> None:
+    @app.before_request
+    def _start_timer():
+        g.analytics = {"start": time.perf_counter()}
+
+    @app.after_request
+    def _record(response):
+        info = g.pop("analytics", None)
+        if info is None or request.path in SKIP_PATHS:
+            return response
+        start = info.pop("start")
+        info.update(
+            timestamp=datetime.now(timezone.utc).isoformat(timespec="milliseconds"),
+            # 라우트 패턴으로 (스캐너의 404 경로마다 집계 키가 늘지 않게, metrics 와 같은 방식)
+            endpoint=request.url_rule.rule if request.url_rule else "unmatched",
+            status=response.status_code,
+            latency_ms=round((time.perf_counter() - start) * 1000, 3),
+        )
+        info["gpt_fallback"] = int(bool(info.get("gpt_fallback")))
+        request_log.record(info)
+        return response
@@ -0,0 +1,36 @@
+# sqlite_store.py
+# SQLite 로 저장하는 모듈(llm_cache, news_store)이 같이 쓰는 연결 관리.
+# gunicorn preload 후 fork 된 워커는 부모 프로세스의 연결을 물려 쓰지 않고 새로 연다.
+
+import os
+import sqlite3
+import threading
+from typing import Optional
+
+
+class SQLiteBacked:
+    """프로세스별 SQLite 연결 (WAL). 하위 클래스는 SCHEMA 와 필요하면 ROW_FACTORY·_migrate 를 둔다."""
+    SCHEMA = ""
+    ROW_FACTORY: Optional[type] = None
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._pid = None
+
+    def _db(self) -> sqlite3.Connection:
+        """self._lock 을 잡은 상태에서 호출"""
+        if self._pid != os.getpid():
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            if self.ROW_FACTORY is not None:
+                self._conn.row_factory = self.ROW_FACTORY
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(self.SCHEMA)
+            self._migrate(self._conn)
+            self._conn.commit()
+            self._pid = os.getpid()
+        return self._conn
+
+    def _migrate(self, conn: sqlite3.Connection) -> None:
+        """이전 스키마의 DB 보정 (기본: 없음)"""
@@ -0,0 +1,286 @@
+# template_catalog.py
+# 통합_노지파일.csv 를 프로세스당 한 번만 읽어 두는 템플릿 카탈로그.
+# 파일의 mtime/크기가 바뀌었을 때만 내용을 해시해 보고, 해시가 달라진 경우에만
+# 새 스냅샷을 만들어 참조를 통째로 교체한다(요청 도중에도 항상 일관된 스냅샷).
+# 같은 CSV 로 빌드한 컴파일 카탈로그(catalog_build.py)가 있으면 그것을 mmap 으로
+# 열고, 없거나 오래됐으면 CSV 를 직접 파싱한다 (어느 쪽도 pandas 를 쓰지 않는다).
+
+import os
+import re
+import csv
+import json
+import hashlib
+import logging
+import threading
+import time
+from io import StringIO
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from catalog_binary import CompiledCatalog, open_compiled
+from metrics import span
+
+logger = logging.getLogger(__name__)
+
+DATA_DIR = "./data"
+CATALOG_PATH = os.path.join(DATA_DIR, "통합_노지파일.csv")
+COMPILED_CATALOG_PATH = os.path.join(DATA_DIR, "통합_노지파일.catalog")
+OUTPUT_COLUMNS = ["작업 항목", "작성 양식", "실무 예시 1", "실무 예시 2"]
+
+# ── 유틸: 소문자+한글+숫자만 남기기 ─────────────────────────────────────────────
+def sanitize(text: str) -> str:
+    return re.sub(r"[^0-9a-z가-힣]", "", text.lower())
+
+# ── alias_map 생성: 모든 변형 키 + 개별 단어 키 등록 ───────────────────────────
+def alias_candidates(template_list: List[str]) -> Iterator[Tuple[str, str]]:
+    """(키, 템플릿) 후보를 등록 순서대로 — 같은 키는 나중 것이 이긴다"""
+    SUFFIXES = ["점검표","계획서","서식","표","양식"]
+    for tpl in template_list:
+        low = tpl.lower()
+        # 1) 원본 소문자
+        yield low, tpl
+        # 2) 공백<->언더바
+        yield low.replace(" ", "_"), tpl
+        yield low.replace("_", " "), tpl
+        # 3) 특수문자 제거
+        key3 = sanitize(low)
+        yield key3, tpl
+        # 4) 접미사 변형
+        base = re.sub(r"(서식|양식|점검표|계획서|표)$", "", low).strip()
+        for suf in SUFFIXES:
+            k = base + suf
+            yield k, tpl
+            yield k.replace(" ", "_"), tpl
+            yield sanitize(k), tpl
+
+    # 5) FORCE JSA/LOTO
+    for tpl in template_list:
+        s = sanitize(tpl)
+        if "jsa" in s or "작업안전분석" in s:
+            yield "jsa", tpl
+            yield "작업안전분석", tpl
+        if "loto" in s:
+            yield "loto", tpl
+
+    # 6) 개별 단어 키 등록 (범용 키워드 매핑 강화)
+    for tpl in template_list:
+        low = tpl.lower().replace("_", " ")
+        # 단어 분리: 한글/영어/숫자 연속문자
+        words = re.findall(r"[0-9a-z가-힣]+", low)
+        for w in words:
+            sw = sanitize(w)
+            if sw:
+                yield sw, tpl
+
+def build_alias_map(template_list: List[str]) -> dict:
+    return dict(alias_candidates(template_list))
+
+
+# ── 수기 별칭 (구 merged_safety_gpt_flask_app 의 KEYWORD_ALIAS) ──────────────────
+# 대상 템플릿이 카탈로그에 있을 때만(정규화 이름 기준) 등록하며, 자동 생성 별칭보다 우선한다
+# (템플릿명 자체인 키는 덮지 않고, 같은 키가 여러 번 나오면 먼저 나온 것).
+# dict 리터럴은 같은 키를 조용히 덮어쓰므로 (키, 대상) 목록으로 두고, 중복은 catalog_validate 가 잡는다.
+CURATED_ALIASES: List[Tuple[str, str]] = [
+    ("고소작업 계획서", "고소작업대작업계획서"), ("고소 작업 계획서", "고소작업대작업계획서"),
+    ("고소작업대 계획서", "고소작업대작업계획서"), ("고소작업", "고소작업대작업계획서"),
+    ("밀폐공간 계획서", "밀폐공간작업계획서"), ("밀폐공간 작업 계획서", "밀폐공간작업계획서"),
+    ("밀폐공간작업 계획서", "밀폐공간작업계획서"), ("밀폐공간", "밀폐공간작업계획서"),
+    ("정전 작업 허가서", "정전작업허가서"), ("정전작업", "정전작업허가서"),
+    ("해체 작업계획서", "해체작업계획서"), ("해체 계획서", "해체작업계획서"),
+    ("구조물 해체 계획", "해체작업계획서"), ("해체작업", "해체작업계획서"),
+    ("크레인 계획서", "크레인작업계획서"), ("크레인 작업 계획서", "크레인작업계획서"),
+    ("양중기 작업계획서", "크레인작업계획서"),
+    ("고온 작업 허가서", "고온작업허가서"), ("고온작업", "고온작업허가서"),
+    ("화기작업 허가서", "화기작업허가서"), ("화기 작업계획서", "화기작업허가서"), ("화기작업", "화기작업허가서"),
+    ("전기 작업계획서", "전기작업계획서"), ("전기 계획서", "전기작업계획서"), ("전기작업", "전기작업계획서"),
+    ("굴착기 작업계획서", "굴착기작업계획서"), ("굴착기 계획서", "굴착기작업계획서"), ("굴삭기 작업계획서", "굴착기작업계획서"),
+    ("용접작업 계획서", "용접용단작업허가서"), ("용접용단 계획서", "용접용단작업허가서"), ("용접작업", "용접용단작업허가서"),
+    ("전기 작업 허가서", "전기작업허가서"), ("고압 전기작업 계획서", "전기작업허가서"), ("전기 허가서", "전기작업허가서"),
+    ("비계 작업 계획서", "비계작업계획서"), ("비계 계획서", "비계작업계획서"), ("비계작업계획", "비계작업계획서"),
+    ("협착 작업 계획서", "협착위험작업계획서"), ("협착 계획서", "협착위험작업계획서"),
+    ("양중 작업 계획서", "양중작업계획서"),
+    ("고압가스 작업 계획서", "고압가스작업계획서"), ("고압가스 계획서", "고압가스작업계획서"),
+]
+
+def apply_curated_aliases(alias: dict, template_list: List[str]) -> dict:
+    # resolver 는 '계획서' 같은 요청 접미사를 떼고 조회하므로 뗀 키로도 등록한다
+    from keyword_resolver import normalize_query
+
+    by_norm = {sanitize(t): t for t in template_list}
+    own = set(by_norm) | {t.lower() for t in template_list}
+    curated = set()
+    for key, target in CURATED_ALIASES:
+        tpl = by_norm.get(sanitize(target))
+        if not tpl:
+            continue
+        for k in (sanitize(key), normalize_query(key)[1]):
+            if k and k not in own and k not in curated:
+                alias[k] = tpl
+                curated.add(k)
+    return alias
+
+
+# 별칭 생성 규칙(alias_candidates / apply_curated_aliases)을 바꾸면 올린다
+ALIAS_REVISION = "2"
+# 컴파일된 카탈로그를 만든 코드의 리비전: CSV 가 같아도 이것이 다르면 다시 빌드해야 한다
+BUILDER_REVISION = hashlib.sha1(
+    json.dumps([ALIAS_REVISION, OUTPUT_COLUMNS, CURATED_ALIASES], ensure_ascii=False).encode("utf-8")
+).hexdigest()
+
+
+class CatalogError(Exception):
+    """카탈로그를 사용할 수 없을 때 (HTTP 상태코드 포함)"""
+
+    def __init__(self, message: str, status: int = 500):
+        super().__init__(message)
+        self.status = status
+
+
+# ── CSV 파싱: 템플릿명별 출력 행 (빈 셀 → None), CSV 원래 순서 유지 ─────────────
+def parse_catalog_csv(raw: bytes) -> Tuple[List[str], Dict[str, int], Dict[str, List[Tuple]]]:
+    """(정렬된 템플릿명, 템플릿별 행 수, 템플릿별 OUTPUT_COLUMNS 행)"""
+    reader = csv.reader(StringIO(raw.decode("utf-8-sig"), newline=""))
+    header = next(reader, None) or []
+    if "템플릿명" not in header:
+        raise CatalogError("필요한 '템플릿명' 컬럼이 없습니다.", 500)
+    name_i = header.index("템플릿명")
+    cols = [header.index(c) if c in header else None for c in OUTPUT_COLUMNS]
+
+    freq: Dict[str, int] = {}
+    rows: Dict[str, List[Tuple]] = {}
+    for rec in reader:
+        name = rec[name_i] if name_i < len(rec) else ""
+        if not name:
+            continue
+        freq[name] = freq.get(name, 0) + 1
+        rows.setdefault(name, []).append(tuple(
+            rec[c] if c is not None and c < len(rec) and rec[c] != "" else None for c in cols
+        ))
+    return sorted(freq), freq, rows
+
+
+# ── 카탈로그 스냅샷: 한 번 만들면 변경하지 않는다 ───────────────────────────────
+class CatalogSnapshot:
+    def __init__(self, version: str, templates: List[str], alias_map: Dict[str, str],
+                 freq: Dict[str, int], row_source: Callable[[str], List[Tuple]],
+                 alias_keys: Optional[List[str]] = None):
+        self.version = version
+        self.loaded_at = time.time()
+        self.templates: List[str] = templates
+        self.alias_map: Dict[str, str] = alias_map
+        self.alias_keys: List[str] = alias_keys if alias_keys is not None else sorted(alias_map)
+        self.freq: Dict[str, int] = freq
+        self._row_source = row_source
+
+        # 키워드 resolver 인덱스는 카탈로그 버전당 한 번만 만든다
+        from keyword_resolver import KeywordResolver
+        with span("resolver_index"):
+            self.resolver = KeywordResolver(self.templates, self.alias_map, self.freq)
+
+    @classmethod
+    def from_csv(cls, raw: bytes, version: str) -> "CatalogSnapshot":
+        with span("catalog_parse"):
+            templates, freq, rows = parse_catalog_csv(raw)
+        with span("alias_map"):
+            alias_map = apply_curated_aliases(build_alias_map(templates), templates)
+        return cls(version, templates, alias_map, freq, lambda tpl: rows.get(tpl, []))
+
+    @classmethod
+    def from_compiled(cls, compiled: CompiledCatalog) -> "CatalogSnapshot":
+        """별칭 색인은 빌드 때 만든 것을 그대로, 행은 요청 시 mmap 에서 디코딩"""
+        with span("catalog_mmap"):
+            templates = compiled.templates()
+            freq = dict(zip(templates, compiled.freq()))
+            aliases = compiled.aliases()
+            alias_map = {k: templates[i] for k, i in aliases}
+        index = {t: i for i, t in enumerate(templates)}
+
+        def row_source(tpl: str) -> List[Tuple]:
+            i = index.get(tpl)
+            return compiled.rows(i) if i is not None else []
+
+        return cls(compiled.source_version, templates, alias_map, freq, row_source,
+                   alias_keys=[k for k, _ in aliases])
+
+    def get_rows(self, tpl: str) -> List[Tuple]:
+        return self._row_source(tpl)
+
+
+# ── 프로세스 전역 카탈로그 (핫 리로드) ────────────────────────────────────────
+class TemplateCatalog:
+    def __init__(self, path: str = CATALOG_PATH, check_interval: float = 1.0,
+                 compiled_path: Optional[str] = COMPILED_CATALOG_PATH):
+        self.path = path
+        self.compiled_path = compiled_path
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._snapshot: Optional[CatalogSnapshot] = None
+        self._stat_key = None
+        self._checked_at = 0.0
+
+    def get(self) -> CatalogSnapshot:
+        snap = self._snapshot
+        if snap is not None and time.monotonic() - self._checked_at < self.check_interval:
+            return snap
+        with self._lock:
+            return self._refresh()
+
+    def current(self) -> Optional[CatalogSnapshot]:
+        """파일 확인 없이 현재 올라와 있는 스냅샷 (없으면 None)"""
+        return self._snapshot
+
+    def reload(self) -> CatalogSnapshot:
+        """stat 캐시를 무시하고 즉시 파일을 다시 확인"""
+        with self._lock:
+            self._stat_key = None
+            return self._refresh()
+
+    def _refresh(self) -> CatalogSnapshot:
+        self._checked_at = time.monotonic()
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            raise CatalogError("통합 CSV 파일이 없습니다.", 404)
+
+        stat_key = (st.st_mtime_ns, st.st_size)
+        snap = self._snapshot
+        if snap is not None and stat_key == self._stat_key:
+            return snap
+
+        with span("catalog_read"):
+            with open(self.path, "rb") as f:
+                raw = f.read()
+            version = hashlib.sha1(raw).hexdigest()
+        if snap is not None and version == snap.version:
+            self._stat_key = stat_key
+            return snap
+
+        try:
+            new_snap = self._load(raw, version)
+        except Exception as e:
+            # 쓰는 도중의 파일 등: 이전 스냅샷이 있으면 계속 사용
+            if snap is None or isinstance(e, CatalogError):
+                raise
+            logger.error(f"카탈로그 리로드 실패, 이전 버전 유지: {e}")
+            return snap
+
+        self._snapshot = new_snap
+        self._stat_key = stat_key
+        logger.info(f"Template catalog loaded: {len(new_snap.templates)} templates (v{version[:8]})")
+        return new_snap
+
+    def _load(self, raw: bytes, version: str) -> CatalogSnapshot:
+        compiled = open_compiled(self.compiled_path, version, BUILDER_REVISION)
+        if compiled is not None:
+            return CatalogSnapshot.from_compiled(compiled)
+        if self.compiled_path and os.path.exists(self.compiled_path):
+            logger.warning("컴파일된 카탈로그가 CSV 또는 빌더 리비전과 다릅니다 → CSV 직접 파싱 (python catalog_build.py 로 다시 빌드)")
+        return CatalogSnapshot.from_csv(raw, version)
+
+
+catalog = TemplateCatalog(
+    check_interval=float(os.getenv("CATALOG_CHECK_INTERVAL", "1.0")),
+    compiled_path=os.getenv("CATALOG_COMPILED_PATH", COMPILED_CATALOG_PATH),
+)
+
+def get_catalog() -> CatalogSnapshot:
+    return catalog.get()
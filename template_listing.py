@@ -0,0 +1,109 @@
+# template_listing.py
+# /list_templates 응답 재료: 카탈로그 버전당 한 번만 만든다.
+# 전체 목록(별칭 포함/제외) 본문은 JSON 직렬화 + gzip 압축까지 미리 해 두고,
+# 필터/페이지 요청은 미리 정규화해 둔 이름으로 거른다. ETag 는 버전 + 질의로 만든다.
+
+import gzip
+import json
+import hashlib
+import threading
+from bisect import bisect_left
+from typing import List, Optional
+
+from template_catalog import CatalogSnapshot, sanitize
+
+GZIP_MIN_SIZE = 1024
+MATCH_MODES = ("substring", "prefix")
+
+
+def _dumps(payload: dict) -> bytes:
+    # Flask jsonify 와 같은 모양 (키 정렬, 공백 없음, 한글 그대로)
+    return json.dumps(payload, ensure_ascii=False, sort_keys=True, separators=(",", ":")).encode("utf-8")
+
+
+class PreparedBody:
+    """직렬화된 JSON 본문 + (충분히 크면) gzip 본문 + ETag"""
+
+    def __init__(self, raw: bytes, etag: str):
+        self.raw = raw
+        self.gzipped = gzip.compress(raw, 6) if len(raw) >= GZIP_MIN_SIZE else None
+        self.etag = etag
+
+
+class _NameIndex:
+    """원래 순서의 이름 목록 + 정규화 키 (접두 검색용 정렬본 포함)"""
+
+    def __init__(self, names: List[str]):
+        self.names = names
+        self.keys = [sanitize(n) for n in names]
+        self._sorted = sorted((k, i) for i, k in enumerate(self.keys))
+        self._sorted_keys = [k for k, _ in self._sorted]
+
+    def filter(self, q: str, mode: str) -> List[str]:
+        if not q:
+            return self.names
+        if mode == "prefix":
+            lo = bisect_left(self._sorted_keys, q)
+            hits = []
+            for k, i in self._sorted[lo:]:
+                if not k.startswith(q):
+                    break
+                hits.append(i)
+            return [self.names[i] for i in sorted(hits)]
+        return [n for n, k in zip(self.names, self.keys) if q in k]
+
+
+class TemplateListing:
+    def __init__(self, snap: CatalogSnapshot):
+        self.version = snap.version
+        self._templates = _NameIndex(snap.templates)
+        self._aliases = _NameIndex(snap.alias_keys)
+        self._full = {
+            True: self._prepare({"template_list": snap.templates, "alias_keys": snap.alias_keys}, "full"),
+            False: self._prepare({"template_list": snap.templates}, "templates"),
+        }
+
+    def _prepare(self, payload: dict, tag: str) -> PreparedBody:
+        etag = hashlib.sha1(f"{self.version}\0{tag}".encode("utf-8")).hexdigest()
+        return PreparedBody(_dumps(payload), etag)
+
+    def full(self, include_aliases: bool) -> PreparedBody:
+        return self._full[include_aliases]
+
+    def query_etag(self, q: str, mode: str, include_aliases: bool,
+                   page: Optional[int], per_page: Optional[int]) -> str:
+        key = f"{self.version}\0{q}\0{mode}\0{int(include_aliases)}\0{page}\0{per_page}"
+        return hashlib.sha1(key.encode("utf-8")).hexdigest()
+
+    def query(self, q: str, mode: str, include_aliases: bool,
+              page: Optional[int], per_page: Optional[int]) -> PreparedBody:
+        """필터/페이지 적용 본문 (q 는 sanitize 된 값)"""
+        lists = {"template_list": self._templates.filter(q, mode)}
+        if include_aliases:
+            lists["alias_keys"] = self._aliases.filter(q, mode)
+
+        payload = dict(lists)
+        if per_page is not None:
+            start = (page - 1) * per_page
+            payload = {k: v[start:start + per_page] for k, v in lists.items()}
+            payload.update(page=page, per_page=per_page,
+                           total_templates=len(lists["template_list"]))
+            if include_aliases:
+                payload["total_aliases"] = len(lists["alias_keys"])
+        return PreparedBody(_dumps(payload), self.query_etag(q, mode, include_aliases, page, per_page))
+
+
+# ── 버전별 캐시 (최신 버전 하나만 유지) ───────────────────────────────────────
+_lock = threading.Lock()
+_current: Optional[TemplateListing] = None
+
+
+def listing_for(snap: CatalogSnapshot) -> TemplateListing:
+    global _current
+    listing = _current
+    if listing is not None and listing.version == snap.version:
+        return listing
+    with _lock:
+        if _current is None or _current.version != snap.version:
+            _current = TemplateListing(snap)
+        return _current
@@ -0,0 +1,371 @@
+# template_routes.py
+# 템플릿 목록 / XLSX 생성 / 카탈로그 내보내기 / 일괄 내보내기 라우트
+
+from flask import Blueprint, request, jsonify, Response, send_file
+import os
+import json
+from urllib.parse import quote
+import logging
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from tempfile import SpooledTemporaryFile
+from typing import Optional
+
+from template_catalog import OUTPUT_COLUMNS, CatalogError, get_catalog, sanitize
+from template_listing import MATCH_MODES, listing_for
+from xlsx_writer import (
+    XLSX_MIMETYPE, column_widths, iter_file, render_xlsx, sheet_title,
+    stream_xlsx, stream_xlsx_sheets
+)
+from xlsx_cache import xlsx_cache, xlsx_etag
+from xlsx_prebuilt import prebuilt_xlsx
+from keyword_resolver import normalize_query
+from llm_cache import CELL_TYPES, chat_completion, promoted_templates
+from request_log import annotate
+from metrics import CACHE_REQUESTS, RESOLVER_STEPS, span
+from capacity import Overloaded, SharedSlot, upstream_requests
+
+logger = logging.getLogger(__name__)
+
+bp = Blueprint("templates", __name__)
+
+# ── 템플릿 리스트 조회 ─────────────────────────────────────────────────────────
+LIST_MAX_PER_PAGE = 1000
+LIST_DEFAULT_PER_PAGE = 100
+
+def _int_arg(name: str, default: int = None):
+    v = request.args.get(name)
+    if v is None or v == "":
+        return default
+    n = int(v)  # ValueError → 400
+    if n < 1:
+        raise ValueError(name)
+    return n
+
+def _list_response(etag: str, status: int = 200):
+    resp = Response(status=status, mimetype="application/json")
+    resp.set_etag(etag)
+    resp.headers["Cache-Control"] = "no-cache"
+    resp.headers["Vary"] = "Accept-Encoding"
+    return resp
+
+def prepared_response(body):
+    """미리 만든 JSON 본문 (gzip 을 받는 클라이언트에는 압축본)"""
+    if request.if_none_match.contains(body.etag):
+        return _list_response(body.etag, 304)
+    resp = _list_response(body.etag)
+    if body.gzipped is not None and request.accept_encodings["gzip"]:
+        resp.data = body.gzipped
+        resp.headers["Content-Encoding"] = "gzip"
+    else:
+        resp.data = body.raw
+    return resp
+
+@bp.route("/list_templates", methods=["GET"])
+def list_templates():
+    """?q=검색어&match=substring|prefix&include_aliases=0&page=1&per_page=100"""
+    q = sanitize(request.args.get("q", ""))
+    mode = request.args.get("match", "substring")
+    include_aliases = request.args.get("include_aliases", "1").lower() not in ("0", "false", "no")
+    if mode not in MATCH_MODES:
+        return jsonify(error="match 는 substring 또는 prefix 여야 합니다."), 400
+    try:
+        page = _int_arg("page")
+        per_page = _int_arg("per_page", LIST_DEFAULT_PER_PAGE if page else None)
+    except ValueError:
+        return jsonify(error="page, per_page 는 1 이상의 정수여야 합니다."), 400
+    if per_page is not None:
+        page = page or 1
+        per_page = min(per_page, LIST_MAX_PER_PAGE)
+
+    try:
+        snap = get_catalog()
+    except CatalogError as e:
+        return jsonify(error=str(e)), e.status
+    listing = listing_for(snap)
+
+    if not q and per_page is None:
+        return prepared_response(listing.full(include_aliases))
+    # 304 는 본문을 만들기 전에 판단
+    etag = listing.query_etag(q, mode, include_aliases, page, per_page)
+    if request.if_none_match.contains(etag):
+        return _list_response(etag, 304)
+    return prepared_response(listing.query(q, mode, include_aliases, page, per_page))
+
+# ── 파일 응답 헬퍼 ────────────────────────────────────────────────────────────
+def xlsx_response(body, name: str, etag: str = None):
+    return file_response(body, f"{name}.xlsx", XLSX_MIMETYPE, etag)
+
+def file_response(body, filename: str, mimetype: str, etag: str = None):
+    disp = quote(filename)
+    resp = Response(
+        body,
+        headers={
+            "Content-Type": mimetype,
+            "Content-Disposition": f"attachment; filename*=UTF-8''{disp}",
+            "Cache-Control": "public, max-age=3600"
+        }
+    )
+    if etag:
+        resp.set_etag(etag)
+    return resp
+
+# ── 매칭 실패 시 GPT 로 기본 양식 생성 (승격된 양식 → LLM 캐시 → GPT) ──────────────
+def parse_generated_rows(content: Optional[str]) -> Optional[list]:
+    """GPT 응답(JSON 객체 배열) → OUTPUT_COLUMNS 순서의 행, 형식이 다르거나
+    셀 값이 목록/객체이면 None"""
+    try:
+        data = json.loads(content)
+        if not isinstance(data, list) or not data or not all(
+                isinstance(d, dict) and any(c in d for c in OUTPUT_COLUMNS) for d in data):
+            return None
+        rows = [tuple(d.get(c) for c in OUTPUT_COLUMNS) for d in data]
+    except (ValueError, TypeError, AttributeError):
+        return None
+    if not all(isinstance(v, CELL_TYPES) for row in rows for v in row):
+        return None
+    return rows
+
+def gpt_template_rows(raw: str, gate=upstream_requests.slot) -> list:
+    """GPT 생성 행 — 승격된 템플릿/LLM 캐시 적중이 아니라 실제로 호출할 때만 gate 자리를 잡는다"""
+    key = normalize_query(raw)[1]
+    promoted = promoted_templates.get(key)
+    if promoted is not None:
+        CACHE_REQUESTS.inc(cache="promoted", result="hit")
+        annotate(cache="promoted")
+        return promoted
+
+    system = {
+        "role": "system",
+        "content": (
+            "당신은 산업안전 문서 템플릿 전문가입니다.\n"
+            "다음 컬럼(작업 항목, 작성 양식, 실무 예시 1, 실무 예시 2)을 가진 JSON 배열을 5개 이상 생성해주세요.\n"
+            f"템플릿명: {raw}"
+        )
+    }
+    user = {"role": "user", "content": f"템플릿명 '{raw}'의 기본 양식을 JSON 배열로 주세요."}
+    # 행으로 읽히는 응답만 LLM 캐시에 남긴다 (형식이 틀린 응답은 다음 요청에서 다시 생성)
+    content = chat_completion(
+        model="gpt-4o-mini", messages=[system, user],
+        max_tokens=800, temperature=0.7,
+        cacheable=lambda c: parse_generated_rows(c) is not None, gate=gate
+    )
+    rows = parse_generated_rows(content)
+    if rows is None:
+        return [(
+            raw,
+            (content or "").replace("\n", " "),
+            "",
+            ""
+        )]
+    promoted_templates.promote(key, raw, json.loads(content))
+    return rows
+
+# ── 엑셀 생성 엔드포인트 ───────────────────────────────────────────────────────
+@bp.route("/create_xlsx", methods=["GET"])
+def create_xlsx():
+    raw = request.args.get("template", "")
+    try:
+        snap = get_catalog()
+    except CatalogError as e:
+        return jsonify(error=str(e)), e.status
+
+    annotate(keyword=raw)
+    try:
+        with span("resolve"):
+            tpl, step = snap.resolver.resolve_with_step(raw)
+    except ValueError as e:
+        logger.warning(str(e))
+        RESOLVER_STEPS.inc(step="none")
+        # fallback: GPT에게 JSON 요청
+        annotate(gpt_fallback=True)
+        out_rows = gpt_template_rows(raw)
+        return xlsx_response(stream_xlsx(OUTPUT_COLUMNS, out_rows), raw)
+
+    logger.info(f"Matched template: {tpl}")
+    RESOLVER_STEPS.inc(step=step)
+    annotate(template=tpl, step=step)
+
+    # 빌드 단계에서 미리 렌더링된 파일 (ETag 는 내용 키, 304 는 send_file 이 처리)
+    pre = prebuilt_xlsx.lookup(tpl, snap.version)
+    if pre is not None:
+        path, key = pre
+        CACHE_REQUESTS.inc(cache="prebuilt", result="hit")
+        annotate(cache="prebuilt")
+        return send_file(path, mimetype=XLSX_MIMETYPE, as_attachment=True,
+                         download_name=f"{tpl}.xlsx", etag=key, max_age=3600)
+
+    etag = xlsx_etag(tpl, snap.version)
+    if request.if_none_match.contains(etag):
+        annotate(cache="not_modified")
+        resp = xlsx_response(b"", tpl, etag)
+        resp.status_code = 304
+        return resp
+
+    body, hit = xlsx_cache.get_or_render(tpl, snap)
+    annotate(cache="hit" if hit else "miss")
+    return xlsx_response(body, tpl, etag)
+
+# ── 전체 카탈로그 내보내기 (스트리밍) ─────────────────────────────────────────
+@bp.route("/export_catalog", methods=["GET"])
+def export_catalog():
+    try:
+        snap = get_catalog()
+    except CatalogError as e:
+        return jsonify(error=str(e)), e.status
+
+    name = "통합_템플릿_카탈로그"
+    etag = xlsx_etag("\0export", snap.version)
+    if request.if_none_match.contains(etag):
+        resp = xlsx_response(b"", name, etag)
+        resp.status_code = 304
+        return resp
+
+    headers = ["템플릿명"] + OUTPUT_COLUMNS
+    def rows():
+        for tpl in snap.templates:
+            for row in snap.get_rows(tpl):
+                yield (tpl,) + row
+
+    widths = column_widths(headers, rows())
+    return xlsx_response(stream_xlsx(headers, rows(), widths), name, etag)
+
+# ── 여러 템플릿 일괄 내보내기 ─────────────────────────────────────────────────
+BATCH_MAX_TEMPLATES = int(os.getenv("BATCH_MAX_TEMPLATES", "30"))
+batch_pool = ThreadPoolExecutor(
+    max_workers=int(os.getenv("BATCH_WORKERS", "4")), thread_name_prefix="xlsx-batch"
+)
+
+def _batch_params():
+    """(키워드 목록, 형식) — POST 본문 모양이 틀리면 ValueError"""
+    if request.method == "POST":
+        body = request.get_json(silent=True)
+        if not isinstance(body, dict):
+            raise ValueError("본문은 {\"templates\": [...]} 형태의 JSON 객체여야 합니다.")
+        kws = body.get("templates") or []
+        if not isinstance(kws, list) or not all(isinstance(k, str) for k in kws):
+            raise ValueError("templates 는 문자열 배열이어야 합니다.")
+        fmt = body.get("format", "xlsx")
+    else:
+        kws = []
+        for v in request.args.getlist("template"):
+            kws += v.split(",")
+        fmt = request.args.get("format", "xlsx")
+    kws = [k.strip() for k in kws if k.strip()]
+    return kws, fmt
+
+BATCH_REPORT_COLUMNS = ["키워드", "템플릿", "상태", "매칭 단계", "시트/파일", "오류"]
+BATCH_SUMMARY_MAX_BYTES = 1024
+
+def _batch_report_rows(report: list) -> list:
+    return [(e["keyword"], e["template"], e["status"], e.get("step"),
+             e.get("sheet") or e.get("file"), e.get("error")) for e in report]
+
+def _batch_summary(report: list) -> str:
+    """X-Batch-Report 헤더: 상태별 개수 + 실패 키워드 (헤더 크기 상한 안에서만)"""
+    summary = {}
+    for e in report:
+        summary[e["status"]] = summary.get(e["status"], 0) + 1
+    failed = [e["keyword"] for e in report if e["status"] == "failed"]
+    summary["failed_keywords"] = []
+    for kw in failed:
+        summary["failed_keywords"].append(kw)
+        if len(json.dumps(summary, ensure_ascii=True)) > BATCH_SUMMARY_MAX_BYTES:
+            summary["failed_keywords"].pop()
+            summary["failed_truncated"] = True
+            break
+    return json.dumps(summary, ensure_ascii=True)
+
+def _prepare_sheet(entry: dict, snap, gate) -> tuple:
+    """작업 스레드: 시트 행 + 열 너비 준비 (매칭 실패분은 GPT 생성)"""
+    if entry["status"] == "matched":
+        rows = snap.get_rows(entry["template"])
+    else:
+        rows = gpt_template_rows(entry["keyword"], gate)
+    return rows, column_widths(OUTPUT_COLUMNS, rows)
+
+def _render_file(entry: dict, snap, gate) -> bytes:
+    """작업 스레드: 개별 XLSX 파일 (매칭된 템플릿은 캐시 사용)"""
+    if entry["status"] == "matched":
+        return xlsx_cache.get_or_render(entry["template"], snap)[0]
+    return render_xlsx(OUTPUT_COLUMNS, gpt_template_rows(entry["keyword"], gate))
+
+@bp.route("/create_xlsx_batch", methods=["GET", "POST"])
+def create_xlsx_batch():
+    try:
+        kws, fmt = _batch_params()
+    except ValueError as e:
+        return jsonify(error=str(e)), 400
+    if not kws:
+        return jsonify(error="템플릿 키워드가 비어 있습니다."), 400
+    if len(kws) > BATCH_MAX_TEMPLATES:
+        return jsonify(error=f"한 번에 최대 {BATCH_MAX_TEMPLATES}개까지 요청할 수 있습니다."), 400
+    if fmt not in ("xlsx", "zip"):
+        return jsonify(error="format 은 xlsx 또는 zip 이어야 합니다."), 400
+    try:
+        snap = get_catalog()
+    except CatalogError as e:
+        return jsonify(error=str(e)), e.status
+
+    # 1) 같은 카탈로그 스냅샷으로 한 번에 resolve (같은 템플릿은 한 번만)
+    report, todo, seen = [], [], set()
+    for kw in kws:
+        try:
+            with span("resolve"):
+                tpl, step = snap.resolver.resolve_with_step(kw)
+            entry = {"keyword": kw, "template": tpl, "status": "matched", "step": step}
+        except ValueError:
+            entry = {"keyword": kw, "template": kw, "status": "fallback"}
+        RESOLVER_STEPS.inc(step=entry.get("step", "none"))
+        report.append(entry)
+        if entry["template"] in seen:
+            entry["status"] = "duplicate"
+            continue
+        seen.add(entry["template"])
+        todo.append(entry)
+
+    fallback = any(e["status"] == "fallback" for e in todo)
+    annotate(keyword=",".join(kws), gpt_fallback=fallback)
+
+    # 2) 작업 풀에서 시트/파일 병렬 준비 (실제 GPT 호출이 생기면 외부 호출 자리 하나를 같이 쓴다)
+    work = _prepare_sheet if fmt == "xlsx" else _render_file
+    done, overloaded = [], None
+    with SharedSlot(upstream_requests) as shared:
+        futures = [batch_pool.submit(work, entry, snap, shared.slot) for entry in todo]
+        for entry, fut in zip(todo, futures):
+            try:
+                done.append((entry, fut.result()))
+            except Exception as e:
+                logger.warning(f"Batch item failed: {entry['keyword']}: {e}")
+                entry["status"] = "failed"
+                entry["error"] = str(e)
+                if isinstance(e, Overloaded):
+                    overloaded = e
+    if not done:
+        if overloaded is not None:
+            raise overloaded
+        return jsonify(error="생성된 양식이 없습니다.", report=report), 502
+
+    # 3) 하나의 통합 문서(시트별) 또는 ZIP 으로 묶기
+    used = set()
+    if fmt == "xlsx":
+        sheets = []
+        for entry, (rows, widths) in done:
+            entry["sheet"] = sheet_title(entry["template"], used)
+            sheets.append((entry["sheet"], OUTPUT_COLUMNS, rows, widths))
+        # 키워드별 결과는 마지막 시트에 (헤더에는 요약만)
+        report_rows = _batch_report_rows(report)
+        sheets.append((sheet_title("보고서", used), BATCH_REPORT_COLUMNS, report_rows,
+                       column_widths(BATCH_REPORT_COLUMNS, report_rows)))
+        resp = xlsx_response(stream_xlsx_sheets(sheets), "일괄_양식")
+    else:
+        spool = SpooledTemporaryFile(max_size=8 * 1024 * 1024)
+        with zipfile.ZipFile(spool, "w", zipfile.ZIP_DEFLATED) as zf:
+            for entry, body in done:
+                entry["file"] = sheet_title(entry["template"], used) + ".xlsx"
+                zf.writestr(entry["file"], body)
+            zf.writestr("report.json", json.dumps(report, ensure_ascii=False, indent=2))
+        resp = file_response(iter_file(spool), "일괄_양식.zip", "application/zip")
+
+    resp.headers["X-Batch-Report"] = _batch_summary(report)
+    return resp
@@ -0,0 +1,39 @@
+# tests/conftest.py
+# 앱 모듈은 import 시점에 환경변수로 싱글턴을 만들므로, 저장 경로/외부 서비스 설정을
+# 테스트 전용 임시 디렉터리로 먼저 돌려 둔다.
+
+import os
+import sys
+import tempfile
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+_work = tempfile.mkdtemp(prefix="xlsx-server-test-")
+for key, value in {
+    "OPENAI_API_KEY": "test",
+    "NAVER_CLIENT_ID": "test",
+    "NAVER_CLIENT_SECRET": "test",
+    "NEWS_SCHEDULER": "0",
+    "NEWS_DB_PATH": os.path.join(_work, "news.db"),
+    "LLM_CACHE_PATH": os.path.join(_work, "llm_cache.db"),
+    "ANALYTICS_DIR": os.path.join(_work, "analytics"),
+    "XLSX_PREBUILT_DIR": os.path.join(_work, "xlsx"),
+}.items():
+    os.environ.setdefault(key, value)
+
+# 카탈로그 경로(./data/...)는 작업 디렉터리 기준
+os.chdir(ROOT)
+
+
+@pytest.fixture(scope="session")
+def app():
+    from app import create_app
+    return create_app(warm=False, scheduler=False)
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
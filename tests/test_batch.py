@@ -0,0 +1,40 @@
+import io
+import json
+
+import openpyxl
+import pytest
+
+from template_routes import BATCH_SUMMARY_MAX_BYTES, _batch_summary
+
+
+@pytest.mark.parametrize("body", [
+    ["JSA", "LOTO"],
+    {"templates": "JSA"},
+    {"templates": ["JSA", 1]},
+    {"templates": {"JSA": 1}},
+    "JSA",
+])
+def test_batch_rejects_malformed_body(client, body):
+    r = client.post("/create_xlsx_batch", json=body)
+    assert r.status_code == 400
+    assert "error" in r.get_json()
+
+
+def test_batch_workbook_has_report_sheet(client):
+    r = client.post("/create_xlsx_batch", json={"templates": ["JSA", "LOTO", "jsa"]})
+    assert r.status_code == 200
+    wb = openpyxl.load_workbook(io.BytesIO(r.data))
+    assert len(wb.sheetnames) == 3
+    report = list(wb[wb.sheetnames[-1]].iter_rows(values_only=True))
+    assert [row[2] for row in report[1:]] == ["matched", "matched", "duplicate"]
+    assert json.loads(r.headers["X-Batch-Report"]) == {"matched": 2, "duplicate": 1, "failed_keywords": []}
+
+
+def test_batch_summary_header_is_bounded():
+    report = [{"keyword": "아주 긴 존재하지 않는 작업 양식 키워드 " * 3 + str(i), "template": "x",
+               "status": "failed"} for i in range(30)]
+    header = _batch_summary(report)
+    assert len(header) <= BATCH_SUMMARY_MAX_BYTES
+    summary = json.loads(header)
+    assert summary["failed"] == 30 and summary["failed_truncated"]
+    assert 0 < len(summary["failed_keywords"]) < 30
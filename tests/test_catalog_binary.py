@@ -0,0 +1,57 @@
+import hashlib
+
+import pytest
+
+from catalog_binary import open_compiled, write_compiled
+from catalog_build import build
+from template_catalog import (
+    BUILDER_REVISION, CATALOG_PATH, OUTPUT_COLUMNS, CatalogSnapshot, TemplateCatalog, parse_catalog_csv
+)
+
+
+@pytest.fixture(scope="module")
+def raw():
+    with open(CATALOG_PATH, "rb") as f:
+        return f.read()
+
+
+@pytest.fixture
+def compiled_path(tmp_path):
+    path = str(tmp_path / "catalog.catalog")
+    build(CATALOG_PATH, path)
+    return path
+
+
+def test_compiled_matches_csv(raw, compiled_path):
+    version = hashlib.sha1(raw).hexdigest()
+    from_csv = CatalogSnapshot.from_csv(raw, version)
+    compiled = CatalogSnapshot.from_compiled(open_compiled(compiled_path, version, BUILDER_REVISION))
+
+    assert compiled.version == from_csv.version
+    assert compiled.templates == from_csv.templates
+    assert compiled.freq == from_csv.freq
+    assert compiled.alias_map == from_csv.alias_map
+    for tpl in from_csv.templates:
+        assert compiled.get_rows(tpl) == from_csv.get_rows(tpl), tpl
+
+
+def _write_with_aliases(path, raw, alias_map, builder):
+    templates, freq, rows = parse_catalog_csv(raw)
+    write_compiled(path, hashlib.sha1(raw).hexdigest(), OUTPUT_COLUMNS,
+                   templates, freq, rows, alias_map, builder)
+
+
+def test_stale_compiled_catalog_is_rejected(raw, tmp_path):
+    version = hashlib.sha1(raw).hexdigest()
+    fresh = CatalogSnapshot.from_csv(raw, version).alias_map
+    # 이전 별칭 규칙으로 만든 파일: CSV 는 같지만 별칭이 다르다
+    old = dict(fresh, **{"옛별칭": next(iter(fresh.values()))})
+    path = str(tmp_path / "old.catalog")
+
+    _write_with_aliases(path, raw, old, "0" * 40)
+    assert open_compiled(path, version, BUILDER_REVISION) is None
+    assert TemplateCatalog(CATALOG_PATH, compiled_path=path).get().alias_map == fresh
+
+    _write_with_aliases(path, raw, old, BUILDER_REVISION)
+    assert open_compiled(path, "0" * 40, BUILDER_REVISION) is None
+    assert TemplateCatalog(CATALOG_PATH, compiled_path=path).get().alias_map == old
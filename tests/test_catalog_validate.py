@@ -0,0 +1,31 @@
+import catalog_validate
+from catalog_validate import ERROR, WARNING, validate
+from template_catalog import CATALOG_PATH
+
+
+def _raw():
+    with open(CATALOG_PATH, "rb") as f:
+        return f.read()
+
+
+def _curated(report):
+    return [i for i in report.issues if i["kind"] == "curated_duplicate"]
+
+
+def test_curated_aliases_have_unique_keys():
+    assert _curated(validate(_raw())) == []
+
+
+def test_duplicate_curated_key_is_reported(monkeypatch):
+    monkeypatch.setattr(catalog_validate, "CURATED_ALIASES", [
+        ("양중기 작업계획서", "크레인작업계획서"),
+        ("양중기작업계획서", "양중작업계획서"),
+        ("크레인 계획서", "크레인작업계획서"),
+        ("크레인 계획서", "크레인작업계획서"),
+    ])
+    issues = _curated(validate(_raw()))
+    # resolver 가 조회하는 접미사 뗀 키('양중기작업', '크레인')로도 잡는다
+    assert [(i["level"], i["key"]) for i in issues] == [
+        (ERROR, "양중기작업계획서"), (ERROR, "양중기작업"),
+        (WARNING, "크레인계획서"), (WARNING, "크레인"),
+    ]
@@ -0,0 +1,96 @@
+import re
+import random
+import difflib
+
+import pytest
+
+import benchmark
+from keyword_resolver import KeywordResolver
+from template_catalog import (
+    CATALOG_PATH, CURATED_ALIASES, apply_curated_aliases, build_alias_map, parse_catalog_csv, sanitize
+)
+
+
+def reference_resolve(raw, templates, alias_map, freq):
+    """인덱스 도입 전 app.resolve_keyword (템플릿 전체 순회) — 실패 시 None"""
+    r = re.sub(
+        r"\s*(?:양식|서식|점검표|계획서|표)(?:을|를)?\s*"
+        r"(?:주세요|줘|달라|해주세요|전달)?$",
+        "",
+        raw.strip(),
+        flags=re.IGNORECASE
+    ).lower()
+    cleaned = sanitize(r)
+
+    def pick_max(cands):
+        return max(cands, key=lambda t: freq.get(t, 0))
+
+    if cleaned in alias_map:
+        return alias_map[cleaned]
+    if "jsa" in cleaned and "jsa" in alias_map:
+        return alias_map["jsa"]
+    if "loto" in cleaned and "loto" in alias_map:
+        return alias_map["loto"]
+    tokens = [t for t in r.split() if t]
+    for cands in (
+        [tpl for tpl in templates if all(tok in tpl.lower() for tok in tokens)],
+        [tpl for tpl in templates if sanitize(tpl).startswith(cleaned)],
+        [tpl for tpl in templates if cleaned in sanitize(tpl)],
+    ):
+        if cands:
+            return pick_max(cands)
+    norms = [sanitize(t) for t in templates]
+    matches = difflib.get_close_matches(cleaned, norms, n=3, cutoff=0.6)
+    if matches:
+        return pick_max([templates[norms.index(m)] for m in matches])
+    return None
+
+
+@pytest.fixture(scope="module")
+def catalog():
+    with open(CATALOG_PATH, "rb") as f:
+        templates, freq, _ = parse_catalog_csv(f.read())
+    alias_map = apply_curated_aliases(build_alias_map(templates), templates)
+    return templates, alias_map, freq, KeywordResolver(templates, alias_map, freq)
+
+
+def _resolve(resolver, q):
+    try:
+        return resolver.resolve_with_step(q)
+    except ValueError:
+        return None, "none"
+
+
+def test_matches_reference_outside_fuzzy_step(catalog):
+    templates, alias_map, freq, resolver = catalog
+    rnd = random.Random(0)
+    queries = (list(templates) + list(alias_map)
+               + [benchmark._suffix_variant(t, rnd) for t in templates]
+               + ["JSA 양식 주세요", "loto", "크레인", "추락 방지 계획서 주세요", "", "없는양식xyz"])
+    for q in queries:
+        got, step = _resolve(resolver, q)
+        if step != "fuzzy":
+            assert got == reference_resolve(q, templates, alias_map, freq), q
+
+
+def test_fuzzy_keeps_every_reference_hit(catalog):
+    # 퍼지 단계는 후보를 추려서 채점하므로 결과가 기존과 다를 수 있지만,
+    # 기존 구현이 원래 템플릿을 찾던 오타는 그대로 찾아야 한다
+    templates, alias_map, freq, resolver = catalog
+    rnd = random.Random(5)
+    for tpl in templates:
+        for _ in range(5):
+            q = benchmark._typo(tpl, rnd)
+            if reference_resolve(q, templates, alias_map, freq) == tpl:
+                assert _resolve(resolver, q)[0] == tpl, q
+
+
+def test_curated_aliases_resolve_to_their_target(catalog):
+    templates, _, _, resolver = catalog
+    by_norm = {sanitize(t): t for t in templates}
+    checked = 0
+    for key, target in CURATED_ALIASES:
+        if sanitize(target) in by_norm:
+            assert resolver.resolve(key) == by_norm[sanitize(target)], key
+            checked += 1
+    assert checked
@@ -0,0 +1,162 @@
+import json
+import time
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+import llm_cache as llm_cache_module
+from capacity import Bulkhead, Overloaded, SharedSlot
+from keyword_resolver import normalize_query
+from llm_cache import CoalescedWaitTimeout, LLMCache, chat_completion, promoted_templates
+from template_catalog import OUTPUT_COLUMNS
+from template_routes import gpt_template_rows
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return LLMCache(str(tmp_path / "llm.db"))
+
+
+def test_get_or_call_skips_uncacheable_and_none(cache):
+    assert cache.get_or_call("a", "m", lambda: "bad", cacheable=lambda c: False) == ("bad", False)
+    assert cache.get("a") is None
+    assert cache.get_or_call("b", "m", lambda: None) == (None, False)
+    assert cache.get("b") is None
+    cache.get_or_call("c", "m", lambda: "good", cacheable=lambda c: True)
+    assert cache.get("c") == "good"
+
+
+@pytest.fixture
+def fake_openai(monkeypatch):
+    answers, calls = [], []
+
+    def create(**kwargs):
+        calls.append(kwargs)
+        msg = SimpleNamespace(content=answers.pop(0))
+        return SimpleNamespace(choices=[SimpleNamespace(message=msg)])
+
+    monkeypatch.setattr(llm_cache_module.openai.chat.completions, "create", create)
+    return answers, calls
+
+
+def test_unparseable_answer_is_not_cached(app, fake_openai):
+    answers, calls = fake_openai
+    answers += ["죄송합니다, JSON 으로 드릴 수 없습니다.", json.dumps([{c: "x" for c in OUTPUT_COLUMNS}])]
+    with app.test_request_context():
+        first = gpt_template_rows("캐시 검증용 양식 하나")
+        second = gpt_template_rows("캐시 검증용 양식 하나")
+    assert first[0][0] == "캐시 검증용 양식 하나"
+    assert second == [("x",) * len(OUTPUT_COLUMNS)]
+    assert len(calls) == 2
+
+
+def test_generated_rows_follow_output_columns(app, fake_openai):
+    answers, calls = fake_openai
+    # 모델이 열 순서를 바꿔 돌려줘도 첫 요청과 승격 후 요청의 열 배치가 같아야 한다
+    data = [{c: f"{c} {i}" for c in reversed(OUTPUT_COLUMNS)} for i in range(3)]
+    answers.append(json.dumps(data, ensure_ascii=False))
+    with app.test_request_context():
+        first = gpt_template_rows("열 순서 검증용 양식")
+        replay = gpt_template_rows("열 순서 검증용 양식")
+    expected = [tuple(f"{c} {i}" for c in OUTPUT_COLUMNS) for i in range(3)]
+    assert first == expected
+    assert replay == expected
+    assert len(calls) == 1
+
+
+def test_only_real_calls_take_an_upstream_slot(app, fake_openai):
+    answers, calls = fake_openai
+    answers.append(json.dumps([{c: "y" for c in OUTPUT_COLUMNS}]))
+    gate = Bulkhead("test", 1)
+    with app.test_request_context():
+        gpt_template_rows("자리 검증용 양식", gate.slot)
+        assert gate.stats()["in_use"] == 0
+        with gate.slot():
+            # 승격된 템플릿은 자리가 없어도 나간다
+            assert gpt_template_rows("자리 검증용 양식", gate.slot) == [("y",) * len(OUTPUT_COLUMNS)]
+            with pytest.raises(Overloaded):
+                gpt_template_rows("자리 검증용 다른 양식", gate.slot)
+    assert len(calls) == 1
+
+
+def test_shared_slot_is_taken_once_and_released():
+    gate = Bulkhead("test", 1)
+    with SharedSlot(gate) as shared:
+        assert gate.stats()["in_use"] == 0
+        with shared.slot():
+            with shared.slot():
+                assert gate.stats()["in_use"] == 1
+    assert gate.stats()["in_use"] == 0
+
+
+def test_nested_cell_answer_is_neither_cached_nor_promoted(app, fake_openai):
+    answers, calls = fake_openai
+    nested = [{c: ["a", "b"] if c == OUTPUT_COLUMNS[2] else "x" for c in OUTPUT_COLUMNS}]
+    answers += [json.dumps(nested, ensure_ascii=False)] * 2
+    with app.test_request_context():
+        first = gpt_template_rows("중첩 셀 검증용 양식")
+        second = gpt_template_rows("중첩 셀 검증용 양식")
+    # 형식이 틀린 응답과 같이 원문 한 행으로 내려가고, 다음 요청은 다시 GPT 를 부른다
+    assert len(first) == 1 and first[0][0] == "중첩 셀 검증용 양식"
+    assert second == first
+    assert len(calls) == 2
+    assert promoted_templates.get(normalize_query("중첩 셀 검증용 양식")[1]) is None
+    assert not promoted_templates.promote("k", "n", nested)
+
+
+def test_nested_cell_answer_renders(client, fake_openai):
+    answers, _ = fake_openai
+    answers.append(json.dumps([{c: {"k": 1} for c in OUTPUT_COLUMNS}]))
+    assert client.get("/create_xlsx", query_string={"template": "zzqq 중첩 렌더 검증"}).status_code == 200
+    assert not answers  # GPT fallback 을 거쳤다
+
+
+def test_coalesced_waiters_take_the_gate(monkeypatch):
+    started, release, calls = threading.Event(), threading.Event(), []
+
+    def create(**kwargs):
+        calls.append(kwargs)
+        started.set()
+        release.wait(5)
+        msg = SimpleNamespace(content="같은 질문 응답")
+        return SimpleNamespace(choices=[SimpleNamespace(message=msg)])
+
+    monkeypatch.setattr(llm_cache_module.openai.chat.completions, "create", create)
+    gate = Bulkhead("test", 1)
+    messages = [{"role": "user", "content": "자리 공유 검증 질문"}]
+    results = []
+
+    def ask():
+        try:
+            results.append(chat_completion("m", messages, gate=gate.slot))
+        except Overloaded:
+            results.append("503")
+
+    leader = threading.Thread(target=ask)
+    leader.start()
+    assert started.wait(5)
+    followers = [threading.Thread(target=ask) for _ in range(7)]
+    for t in followers:
+        t.start()
+    for t in followers:
+        t.join(5)
+    # 호출 하나가 자리를 쥐고 있는 동안 같은 질문은 기다리지 않고 바로 거절된다
+    assert results == ["503"] * 7
+    release.set()
+    leader.join(5)
+    assert results[-1] == "같은 질문 응답" and len(calls) == 1
+
+
+def test_coalesced_waiter_gives_up_after_wait(cache):
+    release = threading.Event()
+    leader = threading.Thread(target=cache.get_or_call,
+                              args=("k", "m", lambda: release.wait(5) and "늦은 응답"))
+    leader.start()
+    while "k" not in cache._inflight:
+        time.sleep(0.01)
+    with pytest.raises(CoalescedWaitTimeout):
+        cache.get_or_call("k", "m", lambda: "쓰이지 않음", wait=0.05)
+    release.set()
+    leader.join(5)
+    assert cache.get("k") == "늦은 응답"
@@ -0,0 +1,49 @@
+import pytest
+
+from news_index import news_index
+from news_store import news_store
+
+CATEGORY = "페이징 검증"
+
+
+@pytest.fixture
+def articles(monkeypatch):
+    monkeypatch.setattr(news_index, "check_interval", 0)
+    news_store.ingest([{
+        "출처": "테스트", "제목": f"페이징 기사 {i}", "링크": f"https://example.com/paging/{i}",
+        "날짜": f"2025-01-{10 + i:02d} 09:00", "본문": "", "provider": "naver", "분류": CATEGORY,
+    } for i in range(7)])
+    return [f"페이징 기사 {i}" for i in reversed(range(7))]
+
+
+def test_cursor_pages_cover_every_article_once(client, articles):
+    titles, cursor = [], None
+    for _ in range(10):
+        args = {"category": CATEGORY, "limit": 3}
+        if cursor:
+            args["cursor"] = cursor
+        r = client.get("/news", query_string=args)
+        assert r.status_code == 200
+        body = r.get_json()
+        assert len(body["items"]) <= 3
+        titles += [n["제목"] for n in body["items"]]
+        cursor = body["next_cursor"]
+        if cursor is None:
+            break
+    assert titles == articles
+
+
+def test_since_until_window(client, articles):
+    r = client.get("/news", query_string={"category": CATEGORY,
+                                          "since": "2025-01-12", "until": "2025-01-14T23:00"})
+    assert [n["제목"] for n in r.get_json()["items"]] == ["페이징 기사 4", "페이징 기사 3", "페이징 기사 2"]
+
+
+@pytest.mark.parametrize("value", ["nan", "inf", "-inf", "NaN", "어제"])
+def test_rejects_bad_time(client, value):
+    assert client.get("/news", query_string={"since": value}).status_code == 400
+    assert client.get("/news", query_string={"until": value}).status_code == 400
+
+
+def test_rejects_bad_cursor(client, articles):
+    assert client.get("/news", query_string={"cursor": "!!"}).status_code == 400
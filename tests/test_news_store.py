@@ -0,0 +1,72 @@
+import pytest
+
+import news_crawler
+from benchmark import FakeUpstreams
+from news_crawler import NewsCrawler
+from news_store import NewsStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    return NewsStore(str(tmp_path / "news.db"))
+
+
+def _article(body, link="https://www.safetynews.co.kr/news/articleView.html?idxno=1"):
+    return {"출처": "안전신문", "제목": "추락 사고 기사", "링크": link,
+            "날짜": "2025-01-31 09:00", "본문": body, "provider": "safetynews", "분류": "추락 사고"}
+
+
+def test_ingest_fills_empty_body(store):
+    assert store.ingest([_article("")]) == 1
+    assert store.ingest([_article("본문 내용")]) == 0
+    assert [r["body"] for r in store.all_articles()] == ["본문 내용"]
+
+
+def test_ingest_keeps_existing_body(store):
+    store.ingest([_article("처음 본문")])
+    store.ingest([_article("")])
+    store.ingest([_article("다른 본문")])
+    assert [r["body"] for r in store.all_articles()] == ["처음 본문"]
+
+
+def test_ingest_ignores_title_duplicate(store):
+    store.ingest([_article("a")])
+    assert store.ingest([_article("b", link="https://other.example/1")]) == 0
+    assert store.count() == 1
+
+
+def test_data_version_tracks_articles_only(store):
+    v0 = store.data_version()
+    store.ingest([_article("")])
+    v1 = store.data_version()
+    store.put_article_body("https://www.safetynews.co.kr/x", "본문", None, None)
+    store.ingest([_article("")])
+    assert v0 < v1 == store.data_version()
+    store.ingest([_article("본문")])
+    assert store.data_version() > v1
+
+    # 다른 연결(다른 워커)의 변경도 보인다
+    other = NewsStore(store.path)
+    other.ingest([_article("x", link="https://other.example/2") | {"제목": "다른 기사"}])
+    assert store.data_version() > v1 + 1
+
+
+def test_partial_crawl_then_full_crawl_fills_bodies(store, monkeypatch):
+    fake = FakeUpstreams(openai_latency=0, naver_latency=0, safetynews_latency=0.6)
+    monkeypatch.setattr(news_crawler, "NAVER_NEWS_URL", fake.url + "/v1/search/news.json")
+    monkeypatch.setattr(news_crawler, "SAFETYNEWS_BASE", fake.url)
+    crawler = NewsCrawler("test", "test", body_cache=store)
+    try:
+        news, partial = crawler.crawl(deadline=1.5)
+        assert partial
+        store.ingest(news)
+        news, partial = crawler.crawl(deadline=60)
+        assert not partial
+        store.ingest(news)
+    finally:
+        crawler.pool.shutdown(wait=False, cancel_futures=True)
+        fake.close()
+
+    rows = [r for r in store.all_articles() if r["provider"] == "safetynews"]
+    assert rows
+    assert [r["link"] for r in rows if not r["body"]] == []
@@ -0,0 +1,13 @@
+import request_log as request_log_module
+
+
+def test_endpoint_is_the_route_pattern(client, monkeypatch):
+    recorded = []
+    monkeypatch.setattr(request_log_module.request_log, "record", recorded.append)
+    client.get("/nope/../wp-admin.php")
+    client.get("/another-scanner-path")
+    client.get("/news", query_string={"since": "nan"})
+    client.get("/health")
+    assert [(e["endpoint"], e["status"]) for e in recorded] == [
+        ("unmatched", 404), ("unmatched", 404), ("/news", 400),
+    ]
@@ -0,0 +1,33 @@
+import os
+
+import pytest
+
+from llm_cache import LLMCache
+from news_store import NewsStore
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="fork 필요")
+@pytest.mark.parametrize("make, write, read", [
+    (NewsStore,
+     lambda s: s.put_article_body("https://example.com/a", "자식 본문", None, None),
+     lambda s: s.get_article_body("https://example.com/a")["body"]),
+    (LLMCache,
+     lambda s: s.put("k", "m", "자식 응답"),
+     lambda s: s.get("k")),
+])
+def test_forked_child_opens_its_own_connection(tmp_path, make, write, read):
+    store = make(str(tmp_path / "store.db"))
+    with store._lock:
+        parent_conn = store._db()
+    pid = os.fork()
+    if pid == 0:  # 자식: 부모의 연결이 아니라 새 연결로 써야 한다
+        try:
+            with store._lock:
+                ok = store._db() is not parent_conn
+            write(store)
+            os._exit(0 if ok else 1)
+        except BaseException:
+            os._exit(2)
+    _, status = os.waitpid(pid, 0)
+    assert os.waitstatus_to_exitcode(status) == 0
+    assert read(store) in ("자식 본문", "자식 응답")
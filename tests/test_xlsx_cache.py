@@ -0,0 +1,41 @@
+import os
+import json
+from datetime import datetime, timedelta, timezone
+
+from request_log import partition_dir, template_request_counts
+from template_catalog import get_catalog
+from xlsx_cache import XlsxCache
+
+
+def _write_agg(base, day, name, by_template):
+    d = partition_dir(day.isoformat(), str(base))
+    os.makedirs(d, exist_ok=True)
+    with open(os.path.join(d, name), "w", encoding="utf-8") as f:
+        json.dump({"requests": sum(by_template.values()), "by_template": by_template}, f)
+
+
+def test_request_counts_sum_recent_aggregates(tmp_path):
+    today = datetime.now(timezone.utc).date()
+    _write_agg(tmp_path, today, "agg-1.json", {"A": 3, "B": 1})
+    _write_agg(tmp_path, today, "agg-2.json", {"B": 4})
+    _write_agg(tmp_path, today - timedelta(days=2), "agg-1.json", {"C": 2})
+    _write_agg(tmp_path, today - timedelta(days=10), "agg-1.json", {"A": 100})
+
+    assert template_request_counts(7, str(tmp_path)) == {"A": 3, "B": 5, "C": 2}
+    assert template_request_counts(1, str(tmp_path)) == {"A": 3, "B": 5}
+
+
+def test_warm_prefers_requested_templates():
+    snap = get_catalog()
+    by_rows = sorted(snap.templates, key=lambda t: -snap.freq.get(t, 0))
+    requested = by_rows[-1]
+
+    cache = XlsxCache(32 * 1024 * 1024)
+    cache.warm(snap, 2, {requested: 5})
+    assert cache.get((requested, snap.version)) is not None
+    assert cache.get((by_rows[0], snap.version)) is not None
+    assert cache.get((by_rows[1], snap.version)) is None
+
+    cache = XlsxCache(32 * 1024 * 1024)
+    cache.warm(snap, 1)
+    assert cache.get((by_rows[0], snap.version)) is not None
@@ -0,0 +1,7 @@
+# wsgi.py
+# gunicorn 진입점: gunicorn -c gunicorn.conf.py wsgi:app
+# 스케줄러는 여기서 켜지 않는다 (fork 후 워커 하나에서만 gunicorn.conf.py 가 시작).
+
+from app import create_app
+
+app = create_app(scheduler=False)
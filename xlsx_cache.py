@@ -0,0 +1,91 @@
+# xlsx_cache.py
+# 완성된 XLSX 바이트의 LRU 캐시 (키: 템플릿명 + 카탈로그 버전, 총 바이트 상한)
+
+import os
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+from template_catalog import OUTPUT_COLUMNS, CatalogSnapshot
+from xlsx_writer import render_xlsx
+from metrics import CACHE_REQUESTS
+
+logger = logging.getLogger(__name__)
+
+# 렌더링 방식이 바뀌면 올려서 기존 ETag 를 무효화
+RENDER_REVISION = "2"
+
+
+def xlsx_etag(tpl: str, version: str) -> str:
+    return hashlib.sha1(f"{RENDER_REVISION}\0{version}\0{tpl}".encode("utf-8")).hexdigest()
+
+
+class XlsxCache:
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Tuple[str, str], bytes]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Tuple[str, str]) -> Optional[bytes]:
+        with self._lock:
+            body = self._entries.get(key)
+            if body is None:
+                self.misses += 1
+                CACHE_REQUESTS.inc(cache="xlsx", result="miss")
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        CACHE_REQUESTS.inc(cache="xlsx", result="hit")
+        return body
+
+    def put(self, key: Tuple[str, str], body: bytes) -> None:
+        if len(body) > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._size -= len(old)
+            self._entries[key] = body
+            self._size += len(body)
+            while self._size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._size,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+    def get_or_render(self, tpl: str, snap: CatalogSnapshot) -> Tuple[bytes, bool]:
+        """(XLSX 바이트, 캐시 적중 여부)"""
+        key = (tpl, snap.version)
+        body = self.get(key)
+        if body is not None:
+            return body, True
+        body = render_xlsx(OUTPUT_COLUMNS, snap.get_rows(tpl))
+        self.put(key, body)
+        return body, False
+
+    def warm(self, snap: CatalogSnapshot, top_n: int,
+             request_counts: Optional[Dict[str, int]] = None) -> int:
+        """요청 수 상위 템플릿을 미리 렌더링 (요청 기록이 없으면 카탈로그 행 수 순)"""
+        counts = request_counts or {}
+        ranked = sorted(snap.templates,
+                        key=lambda t: (-counts.get(t, 0), -snap.freq.get(t, 0)))[:top_n]
+        for tpl in ranked:
+            self.get_or_render(tpl, snap)
+        logger.info(f"XLSX cache warmed: {len(ranked)} templates")
+        return len(ranked)
+
+
+xlsx_cache = XlsxCache(int(os.getenv("XLSX_CACHE_MAX_BYTES", str(32 * 1024 * 1024))))
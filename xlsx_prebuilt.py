@@ -0,0 +1,135 @@
+# xlsx_prebuilt.py
+# 빌드 단계에서 모든 템플릿의 XLSX 를 미리 렌더링해 두는 디렉터리 (내용 주소 방식).
+# 파일명은 렌더링 입력(렌더 리비전 + 열 + 행)의 해시라서 내용이 같은 템플릿은
+# 파일 하나를 같이 쓰고, 다음 빌드에서는 바뀐 템플릿만 다시 렌더링한다.
+# manifest.json 이 카탈로그 버전과 템플릿 → 파일을 기록하며, 서버는 버전이 맞을 때만
+# 디스크의 파일을 그대로 send_file 로 보낸다 (gunicorn 이 sendfile 로 복사 없이 전송).
+#
+#   data/xlsx/manifest.json
+#   data/xlsx/<sha1>.xlsx
+
+import os
+import json
+import time
+import hashlib
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from template_catalog import DATA_DIR, OUTPUT_COLUMNS, CatalogSnapshot
+from xlsx_cache import RENDER_REVISION
+from xlsx_writer import render_xlsx
+
+PREBUILT_DIR = os.path.join(DATA_DIR, "xlsx")
+MANIFEST_NAME = "manifest.json"
+
+
+def content_key(headers: Sequence[str], rows: List[Tuple]) -> str:
+    payload = json.dumps([RENDER_REVISION, list(headers), rows], ensure_ascii=False)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+# ── 빌드 (프로세스 풀) ────────────────────────────────────────────────────────
+def _render_file(path: str, headers: List[str], rows: List[Tuple]) -> int:
+    body = render_xlsx(headers, rows)
+    tmp = f"{path}.tmp{os.getpid()}"
+    with open(tmp, "wb") as f:
+        f.write(body)
+    os.replace(tmp, path)
+    return len(body)
+
+
+def prerender(snap: CatalogSnapshot, out_dir: str = PREBUILT_DIR,
+              workers: Optional[int] = None, extra: Optional[dict] = None) -> dict:
+    """모든 템플릿 XLSX 를 out_dir 에 렌더링하고 manifest 를 교체 → 통계 (workers=1: 프로세스 풀 없이)"""
+    os.makedirs(out_dir, exist_ok=True)
+    files: Dict[str, str] = {}
+    jobs: Dict[str, List[Tuple]] = {}
+    for tpl in snap.templates:
+        rows = snap.get_rows(tpl)
+        key = content_key(OUTPUT_COLUMNS, rows)
+        files[tpl] = key
+        if key not in jobs and not os.path.exists(os.path.join(out_dir, f"{key}.xlsx")):
+            jobs[key] = rows
+
+    args = [(os.path.join(out_dir, f"{key}.xlsx"), OUTPUT_COLUMNS, rows) for key, rows in jobs.items()]
+    if workers == 1 or len(args) < 2:
+        # 자식 프로세스를 만들 수 없는 곳(데몬 프로세스 등)에서는 이 프로세스에서
+        rendered = sum(_render_file(*a) for a in args)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            rendered = sum(f.result() for f in [pool.submit(_render_file, *a) for a in args])
+
+    manifest = {
+        "catalog_version": snap.version,
+        "render_revision": RENDER_REVISION,
+        "built_at": time.time(),
+        "templates": files,
+        **(extra or {}),
+    }
+    path = os.path.join(out_dir, MANIFEST_NAME)
+    tmp = f"{path}.tmp{os.getpid()}"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=1)
+    os.replace(tmp, path)
+
+    # manifest 가 더는 가리키지 않는 이전 빌드의 파일 정리
+    keep = {f"{k}.xlsx" for k in files.values()}
+    removed = 0
+    for name in os.listdir(out_dir):
+        if name.endswith(".xlsx") and name not in keep:
+            os.remove(os.path.join(out_dir, name))
+            removed += 1
+    return {"templates": len(files), "files": len(keep), "rendered": len(jobs),
+            "rendered_bytes": rendered, "removed": removed}
+
+
+# ── 서버: manifest 조회 ──────────────────────────────────────────────────────
+class PrebuiltXlsx:
+    def __init__(self, out_dir: str = PREBUILT_DIR, check_interval: float = 5.0):
+        self.out_dir = os.path.abspath(out_dir)  # send_file 은 상대 경로를 앱 경로 기준으로 본다
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._manifest: Optional[dict] = None
+        self._mtime = None
+        self._checked_at = 0.0
+
+    def _current(self) -> Optional[dict]:
+        if time.monotonic() - self._checked_at < self.check_interval:
+            return self._manifest
+        with self._lock:
+            if time.monotonic() - self._checked_at >= self.check_interval:
+                path = os.path.join(self.out_dir, MANIFEST_NAME)
+                try:
+                    mtime = os.stat(path).st_mtime_ns
+                    if mtime != self._mtime:
+                        with open(path, encoding="utf-8") as f:
+                            self._manifest = json.load(f)
+                        self._mtime = mtime
+                except (OSError, ValueError):
+                    self._manifest, self._mtime = None, None
+                self._checked_at = time.monotonic()
+            return self._manifest
+
+    def lookup(self, tpl: str, version: str) -> Optional[Tuple[str, str]]:
+        """(파일 경로, 내용 키) — manifest 가 없거나 다른 카탈로그 버전이면 None"""
+        m = self._current()
+        if (m is None or m.get("catalog_version") != version
+                or m.get("render_revision") != RENDER_REVISION):
+            return None
+        key = m["templates"].get(tpl)
+        if key is None:
+            return None
+        path = os.path.join(self.out_dir, f"{key}.xlsx")
+        return (path, key) if os.path.exists(path) else None
+
+    def stats(self) -> dict:
+        m = self._current()
+        return {
+            "loaded": m is not None,
+            "catalog_version": m.get("catalog_version") if m else None,
+            "templates": len(m["templates"]) if m else 0,
+        }
+
+
+prebuilt_xlsx = PrebuiltXlsx(os.getenv("XLSX_PREBUILT_DIR", PREBUILT_DIR))
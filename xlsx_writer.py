@@ -0,0 +1,138 @@
+# xlsx_writer.py
+# 템플릿 행 → XLSX 렌더링 (openpyxl write-only 모드)
+# 셀 객체 그래프를 메모리에 쌓지 않고 행 단위로 기록하며, 열 너비는 시트를 다시
+# 훑지 않고 원본 데이터에서 미리 계산한다.
+
+import re
+from io import BytesIO
+from tempfile import SpooledTemporaryFile
+from typing import BinaryIO, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
+
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font, Alignment
+from openpyxl.utils import get_column_letter
+
+from metrics import span
+
+XLSX_MIMETYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+MAX_COLUMN_WIDTH = 60
+WRAP_COLUMNS = ("작성 양식",)
+STREAM_CHUNK_SIZE = 64 * 1024
+SPOOL_MAX_SIZE = 1024 * 1024
+
+# ── 열 너비: 원본 데이터 기준 ─────────────────────────────────────────────────
+def column_widths(headers: List[str], rows: Iterable[Sequence]) -> List[int]:
+    widths = [len(str(h)) for h in headers]
+    n = len(widths)
+    for row in rows:
+        for i, v in enumerate(row[:n]):
+            if v is not None:
+                w = len(str(v))
+                if w > widths[i]:
+                    widths[i] = w
+    return [min(w + 2, MAX_COLUMN_WIDTH) for w in widths]
+
+# ── 시트 기록 ─────────────────────────────────────────────────────────────────
+def write_sheet(ws, headers: List[str], rows: Iterable[Sequence], widths: List[int]) -> None:
+    """write-only 시트에 헤더/행 기록 (widths 는 행보다 먼저 지정해야 한다)"""
+    for i, w in enumerate(widths, 1):
+        ws.column_dimensions[get_column_letter(i)].width = w
+
+    bold = Font(bold=True)
+    center = Alignment(horizontal="center")
+    wrap = Alignment(wrap_text=True)
+    header_cells = []
+    for h in headers:
+        c = WriteOnlyCell(ws, value=h)
+        c.font = bold
+        c.alignment = center
+        header_cells.append(c)
+    ws.append(header_cells)
+
+    wrap_idx = [i for i, h in enumerate(headers) if h in WRAP_COLUMNS]
+    for row in rows:
+        row = list(row)
+        for i in wrap_idx:
+            if i < len(row):
+                c = WriteOnlyCell(ws, value=row[i])
+                c.alignment = wrap
+                row[i] = c
+        ws.append(row)
+
+
+def write_xlsx(fileobj: BinaryIO, headers: List[str], rows: Iterable[Sequence],
+               widths: Optional[List[int]] = None, title: Optional[str] = None) -> None:
+    if widths is None:
+        rows = list(rows)
+        widths = column_widths(headers, rows)
+    with span("xlsx_render"):
+        wb = Workbook(write_only=True)
+        ws = wb.create_sheet(title)
+        write_sheet(ws, headers, rows, widths)
+        wb.save(fileobj)
+
+
+def sheet_title(name: str, used: Set[str]) -> str:
+    """엑셀 시트명 규칙(31자, 금지문자, 중복 불가)에 맞춘 제목"""
+    base = re.sub(r"[\[\]:*?/\\]", "_", name).strip("'") or "Sheet"
+    title = base[:31]
+    n = 2
+    while title.lower() in used:
+        suffix = f" ({n})"
+        title = base[:31 - len(suffix)] + suffix
+        n += 1
+    used.add(title.lower())
+    return title
+
+
+def write_xlsx_sheets(fileobj: BinaryIO,
+                      sheets: Iterable[Tuple[str, List[str], Iterable[Sequence], List[int]]]) -> None:
+    """(시트명, 헤더, 행, 열 너비) 목록 → 시트 여러 개짜리 통합 문서"""
+    with span("xlsx_render"):
+        wb = Workbook(write_only=True)
+        for title, headers, rows, widths in sheets:
+            ws = wb.create_sheet(title)
+            write_sheet(ws, headers, rows, widths)
+        wb.save(fileobj)
+
+
+def render_xlsx(headers: List[str], rows: Iterable[Sequence]) -> bytes:
+    buf = BytesIO()
+    write_xlsx(buf, headers, rows)
+    return buf.getvalue()
+
+# ── 스트리밍 응답용 ──────────────────────────────────────────────────────────
+def iter_file(f: BinaryIO, chunk_size: int = STREAM_CHUNK_SIZE) -> Iterator[bytes]:
+    try:
+        f.seek(0)
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+            yield chunk
+    finally:
+        f.close()
+
+
+def stream_xlsx(headers: List[str], rows: Iterable[Sequence],
+                widths: Optional[List[int]] = None, title: Optional[str] = None) -> Iterator[bytes]:
+    """완성된 XLSX 를 (큰 경우 디스크에 spool 해 두고) 청크 단위로 내보낸다"""
+    spool = SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE)
+    try:
+        write_xlsx(spool, headers, rows, widths, title)
+    except Exception:
+        spool.close()
+        raise
+    return iter_file(spool)
+
+
+def stream_xlsx_sheets(sheets) -> Iterator[bytes]:
+    spool = SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE)
+    try:
+        write_xlsx_sheets(spool, sheets)
+    except Exception:
+        spool.close()
+        raise
+    return iter_file(spool)